@@ -1,32 +1,181 @@
 import os
+import time
 import logging
-import mysql.connector
+import functools
+from collections import OrderedDict
+from mysql.connector import pooling
+from mysql.connector import errors as mysql_errors
 from mysql.connector import Error as MySQLError
 import sqlite3
-from typing import Optional, List, Dict, Any
+import threading
+import json
+import numpy as np
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 from config.settings import Config
 
 logger = logging.getLogger(__name__)
 
+# INSERT ... RETURNING needs SQLite 3.35+
+HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# ── SQLite buffer statements ─────────────────────────────────
+_SQL_INSERT_ATTENDANCE = """
+    INSERT INTO attendance_buffer
+    (worker_id, attendance_date, time_in, time_out, status)
+    VALUES (?, ?, ?, ?, ?)"""
+
+_SQL_UPDATE_TIMEOUT = """
+    UPDATE attendance_buffer
+    SET time_out = ?, hours_worked = ?
+    WHERE worker_id = ? AND attendance_date = ?
+    AND time_out IS NULL AND sync_status = 'pending'"""
+
+_SQL_GET_PENDING = """
+    SELECT * FROM attendance_buffer
+    WHERE sync_status = 'pending'
+    ORDER BY created_at ASC
+    LIMIT ?"""
+
+_SQL_COUNT_PENDING = """
+    SELECT COUNT(*) FROM attendance_buffer
+    WHERE sync_status = 'pending'"""
+
+_SQL_MARK_SYNCED = """
+    UPDATE attendance_buffer
+    SET sync_status = 'synced', synced_at = CURRENT_TIMESTAMP
+    WHERE id = ?"""
+
+# Rows whose values are unchanged are left untouched (no WAL frames)
+_SQL_UPSERT_ENCODING = """
+    INSERT INTO face_encodings_cache
+    (encoding_id, worker_id, encoding_data, first_name, last_name,
+     worker_code, is_active)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(encoding_id) DO UPDATE SET
+        worker_id = excluded.worker_id,
+        encoding_data = excluded.encoding_data,
+        first_name = excluded.first_name,
+        last_name = excluded.last_name,
+        worker_code = excluded.worker_code,
+        is_active = excluded.is_active,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE (worker_id, encoding_data, first_name, last_name,
+           worker_code, is_active)
+      IS NOT (excluded.worker_id, excluded.encoding_data,
+              excluded.first_name, excluded.last_name,
+              excluded.worker_code, excluded.is_active)"""
+
+# Ids are passed as one JSON array, so no bound-parameter limit applies
+_SQL_DELETE_STALE_ENCODINGS = """
+    DELETE FROM face_encodings_cache
+    WHERE encoding_id NOT IN (SELECT value FROM json_each(?))"""
+
+_SQL_GET_ENCODINGS = """
+    SELECT * FROM face_encodings_cache
+    WHERE is_active = 1"""
+
+_SQL_GET_TODAY = """
+    SELECT id AS attendance_id, worker_id,
+           attendance_date, time_in, time_out,
+           status, hours_worked
+    FROM attendance_buffer
+    WHERE worker_id = ? AND attendance_date = ?
+    ORDER BY created_at DESC LIMIT 1"""
+
+_SQL_GET_CONFIG = "SELECT value FROM device_config WHERE key = ?"
+
+_SQL_SET_CONFIG = """
+    INSERT INTO device_config (key, value, updated_at)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(key) DO UPDATE SET
+        value = excluded.value,
+        updated_at = CURRENT_TIMESTAMP"""
+
+# Connection-level failures worth retrying (programming errors are not)
+TRANSIENT_MYSQL_ERRORS = (
+    mysql_errors.OperationalError,
+    mysql_errors.InterfaceError,
+)
+
+
+def _retry(fn):
+    """Retry transient MySQL errors with exponential backoff.
+
+    Reconnects through the pool between attempts and re-raises after
+    ``Config.MAX_RETRY_ATTEMPTS`` tries. Only for calls that are safe to
+    repeat: reads, or steps before a statement reaches the server. A
+    write that lost its connection mid-query may already be committed.
+    """
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        delay = 1.0
+        for attempt in range(1, Config.MAX_RETRY_ATTEMPTS + 1):
+            try:
+                return fn(self, *args, **kwargs)
+            except TRANSIENT_MYSQL_ERRORS as e:
+                if attempt >= Config.MAX_RETRY_ATTEMPTS:
+                    raise
+                logger.warning(
+                    f"MySQL error (attempt {attempt}), retrying in "
+                    f"{delay:.0f}s: {e}")
+                time.sleep(delay)
+                delay *= Config.RETRY_BACKOFF_MULTIPLIER
+                self.connect()
+    return wrapper
+
 
 class MySQLDatabase:
-    """MySQL database connection manager"""
+    """MySQL connection pool manager.
+
+    Each query checks a connection out of a shared pool and returns it
+    when done, so background threads never serialize on one socket.
+    ``is_connected`` reflects whether the server was reachable on the
+    last attempt.
+
+    Writes go through server-side prepared statements cached per pooled
+    connection. Sessions are not reset on pool checkout, since
+    COM_RESET_CONNECTION would drop them.
+    """
+
+    # Max prepared cursors kept across all pooled connections
+    PREPARED_CACHE_SIZE = 32
     
     def __init__(self) -> None:
-        self.connection: Optional[mysql.connector.MySQLConnection] = None
+        self.pool: Optional[pooling.MySQLConnectionPool] = None
         self.is_connected: bool = False
+
+        # Rate-limit implicit reconnects while the server is down
+        self._last_reconnect_attempt: float = 0.0
+        self._reconnect_cooldown: float = 5.0
+
+        # (server connection id, SQL) → prepared cursor, LRU ordered
+        self._prepared: "OrderedDict[Tuple[int, str], Any]" = OrderedDict()
+        # Evicted cursors awaiting close, by server connection id. Closed
+        # by the next thread holding that connection, never from another
+        # thread, since COM_STMT_CLOSE would interleave with its queries.
+        self._evicted: Dict[int, List[Any]] = {}
+        self._prepared_lock = threading.Lock()
     
     def connect(self) -> bool:
-        """Establish MySQL connection"""
+        """Create the connection pool (or verify an existing one)"""
         try:
-            self.connection = mysql.connector.connect(
-                host=Config.MYSQL_HOST,
-                port=Config.MYSQL_PORT,
-                user=Config.MYSQL_USER,
-                password=Config.MYSQL_PASSWORD,
-                database=Config.MYSQL_DATABASE,
-                autocommit=True
-            )
+            if self.pool is None:
+                self.pool = pooling.MySQLConnectionPool(
+                    pool_name='tracksite',
+                    pool_size=Config.MYSQL_POOL_SIZE,
+                    pool_reset_session=False,
+                    user=Config.MYSQL_USER,
+                    password=Config.MYSQL_PASSWORD,
+                    database=Config.MYSQL_DATABASE,
+                    autocommit=True,
+                    use_pure=False,
+                    connection_timeout=Config.MYSQL_CONNECT_TIMEOUT,
+                    **self._endpoint()
+                )
+            else:
+                self.pool.get_connection().close()
+            with self._prepared_lock:
+                self._evict_all()
             self.is_connected = True
             logger.info("MySQL connected")
             return True
@@ -35,61 +184,265 @@ class MySQLDatabase:
             self.is_connected = False
             return False
     
+    @staticmethod
+    def _endpoint() -> Dict[str, Any]:
+        """Unix socket for a local server when available, else TCP"""
+        if (Config.MYSQL_HOST in ('localhost', '127.0.0.1')
+                and Config.MYSQL_SOCKET
+                and os.path.exists(Config.MYSQL_SOCKET)):
+            return {'unix_socket': Config.MYSQL_SOCKET}
+        return {'host': Config.MYSQL_HOST, 'port': Config.MYSQL_PORT}
+    
+    def _ensure(self) -> bool:
+        """Return True if connected, reconnecting at most every few seconds"""
+        if self.is_connected and self.pool is not None:
+            return True
+        now = time.monotonic()
+        if now - self._last_reconnect_attempt < self._reconnect_cooldown:
+            return False
+        self._last_reconnect_attempt = now
+        return self.connect()
+    
     def execute_query(self, query: str, params: Optional[tuple] = None) -> Optional[int]:
         """Execute INSERT/UPDATE/DELETE"""
-        if not self.is_connected or self.connection is None:
+        if not self._ensure():
             logger.warning("MySQL not connected")
             return None
         
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, params or ())
-            last_id = cursor.lastrowid
-            cursor.close()
-            return last_id
+            return self._execute(query, params)
         except MySQLError as e:
             logger.error(f"Query failed: {e}")
-            self.is_connected = False
+            if isinstance(e, TRANSIENT_MYSQL_ERRORS):
+                self.is_connected = False
             return None
     
-    def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
-        """Fetch multiple rows"""
-        if not self.is_connected:
-            if not self.connect():
-                return []
-        
-        if self.connection is None:
-            return []
+    def execute_many(self, query: str, rows: List[tuple]) -> Optional[int]:
+        """Execute a batched INSERT/UPDATE, returns affected row count"""
+        if not rows:
+            return 0
+        if not self._ensure():
+            logger.warning("MySQL not connected")
+            return None
+
+        try:
+            return self._execute_many(query, rows)
+        except MySQLError as e:
+            logger.error(f"Batch query failed: {e}")
+            if isinstance(e, TRANSIENT_MYSQL_ERRORS):
+                self.is_connected = False
+            return None
+    
+    def fetch_all(self, query: str, params: Optional[tuple] = None,
+                  retry: bool = True, strict: bool = False
+                  ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch multiple rows.
+
+        Pass ``retry=False`` on a UI thread: the retry backoff sleeps.
+        With ``strict`` a failed query returns ``None`` rather than
+        ``[]``, so callers can tell it from an empty result.
+        """
+        failed: Optional[List[Dict[str, Any]]] = None if strict else []
+        if not self._ensure():
+            return failed
         
         try:
-            cursor = self.connection.cursor(dictionary=True)
+            if retry:
+                return self._fetch_all_retrying(query, params)
+            return self._fetch_all(query, params)
+        except MySQLError as e:
+            logger.error(f"Fetch failed: {e}")
+            return failed
+
+    def _prepared_cursor(self, conn: Any, query: str) -> Any:
+        """Get (or prepare) a cached cursor for ``query`` on ``conn``."""
+        conn_id = conn.connection_id
+        key = (conn_id, query)
+        with self._prepared_lock:
+            stale = self._evicted.pop(conn_id, [])
+            cursor = self._prepared.get(key)
+            if cursor is not None:
+                self._prepared.move_to_end(key)
+        self._close_cursors(stale)
+        if cursor is not None:
+            return cursor
+
+        cursor = conn.cursor(prepared=True)
+        with self._prepared_lock:
+            self._prepared[key] = cursor
+            if len(self._prepared) > self.PREPARED_CACHE_SIZE:
+                (old_id, _), old = self._prepared.popitem(last=False)
+                self._evicted.setdefault(old_id, []).append(old)
+            stale = self._evicted.pop(conn_id, [])
+        self._close_cursors(stale)
+        return cursor
+
+    def _evict_all(self) -> None:
+        """Move every cached cursor to the close queue (lock held)"""
+        for (conn_id, _), cursor in self._prepared.items():
+            self._evicted.setdefault(conn_id, []).append(cursor)
+        self._prepared.clear()
+
+    @staticmethod
+    def _close_cursors(cursors: List[Any]) -> None:
+        """Close prepared cursors, freeing their server-side statements"""
+        for cursor in cursors:
+            try:
+                cursor.close()
+            except MySQLError:
+                pass  # Connection already gone; nothing left to free
+
+    @_retry
+    def _checkout(self) -> Any:
+        """Check a connection out of the pool (nothing sent yet, so retried)"""
+        return self.pool.get_connection()
+
+    # Writes are not retried once sent: with autocommit on, a lost
+    # connection mid-INSERT may already have committed the row
+    def _execute(self, query: str, params: Optional[tuple]) -> Optional[int]:
+        conn = self._checkout()
+        try:
+            cursor = self._prepared_cursor(conn, query)
+            try:
+                cursor.execute(query, params or ())
+            except MySQLError:
+                with self._prepared_lock:
+                    failed = self._prepared.pop((conn.connection_id, query), None)
+                self._close_cursors([failed] if failed is not None else [])
+                raise
+            return cursor.lastrowid
+        finally:
+            conn.close()
+
+    def _execute_many(self, query: str, rows: List[tuple]) -> int:
+        conn = self._checkout()
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(query, rows)
+            affected = cursor.rowcount
+            cursor.close()
+            return affected
+        finally:
+            conn.close()
+
+    def _fetch_all(self, query: str, params: Optional[tuple]) -> List[Dict[str, Any]]:
+        conn = self.pool.get_connection()
+        try:
+            cursor = conn.cursor(dictionary=True)
             cursor.execute(query, params or ())
             results = cursor.fetchall()
             cursor.close()
             return results if results else []
-        except MySQLError as e:
-            logger.error(f"Fetch failed: {e}")
-            return []
+        finally:
+            conn.close()
     
-    def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
+    _fetch_all_retrying = _retry(_fetch_all)
+
+    def fetch_one(self, query: str, params: Optional[tuple] = None,
+                  retry: bool = True) -> Optional[Dict[str, Any]]:
         """Fetch single row"""
-        results = self.fetch_all(query, params)
+        results = self.fetch_all(query, params, retry)
         return results[0] if results else None
     
     def close(self) -> None:
-        """Close connection"""
-        if self.connection:
-            self.connection.close()
+        """Close all pooled connections"""
+        if self.pool:
+            # Free the prepared statements while their sockets are open
+            with self._prepared_lock:
+                self._evict_all()
+                stale = [c for cursors in self._evicted.values() for c in cursors]
+                self._evicted.clear()
+            self._close_cursors(stale)
+            try:
+                self.pool._remove_connections()
+            except MySQLError:
+                pass
+            self.pool = None
             self.is_connected = False
             logger.info("MySQL closed")
 
 
 class SQLiteDatabase:
-    """Local SQLite for offline buffering"""
+    """Local SQLite for offline buffering.
+
+    The database runs in WAL journal mode, so ``<SQLITE_PATH>-wal`` and
+    ``<SQLITE_PATH>-shm`` sidecar files appear next to the database file.
+
+    Each thread keeps one open connection for the life of the process
+    (see ``_conn``); call ``close()`` on shutdown.
+    """
+
+    # Session pragmas — must be re-applied on every new connection
+    SESSION_PRAGMAS = (
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA busy_timeout=30000;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA cache_size=-20000;"
+        "PRAGMA wal_autocheckpoint=1000;"
+    )
+
+    # Rows per executemany() call for bulk loads
+    INSERT_BATCH_SIZE = 10000
+
+    # Rows per fetchmany() call when reading the face cache
+    FETCH_BATCH_SIZE = 64
     
     def __init__(self) -> None:
         self.db_path: str = Config.SQLITE_PATH
+        self._local = threading.local()
+        self._connections: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self._connections_lock = threading.Lock()
+        # In-memory mirror of face_encodings_cache (read-mostly)
+        self._enc_cache: Optional[List[sqlite3.Row]] = None
+        self._enc_cache_lock = threading.Lock()
         self._init_database()
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's cached connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(self.SESSION_PRAGMAS)
+            if Config.SQLITE_MMAP_MB > 0:
+                # Read-mostly tables: serve pages straight from the mapping
+                conn.execute(
+                    f"PRAGMA mmap_size={Config.SQLITE_MMAP_MB * 1024 * 1024}")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._prune_connections()
+                self._connections.append((threading.current_thread(), conn))
+        return conn
+
+    def _prune_connections(self) -> None:
+        """Close connections owned by threads that have exited."""
+        alive = []
+        for thread, conn in self._connections:
+            if thread.is_alive():
+                alive.append((thread, conn))
+            else:
+                conn.close()
+        self._connections = alive
+
+    def close(self) -> None:
+        """Close every cached connection"""
+        with self._connections_lock:
+            for _, conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections = []
+            self._local = threading.local()
+        logger.info("SQLite closed")
+
+    def checkpoint(self) -> None:
+        """Fold the WAL back into the database and truncate the -wal file"""
+        busy, log_pages, done = self._conn().execute(
+            "PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        if busy:
+            logger.debug(
+                f"WAL checkpoint incomplete ({done}/{log_pages} pages, readers busy)")
     
     def _init_database(self) -> None:
         """Create tables"""
@@ -97,8 +450,15 @@ class SQLiteDatabase:
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn()
         cursor = conn.cursor()
+
+        # page_size only takes effect on a fresh file (before the first
+        # table) and cannot change once the file is in WAL mode
+        cursor.execute("PRAGMA page_size=4096")
+
+        # journal_mode is persistent — set once for the database file
+        cursor.execute("PRAGMA journal_mode=WAL")
         
         # Attendance buffer
         cursor.execute("""
@@ -115,13 +475,28 @@ class SQLiteDatabase:
                 synced_at TIMESTAMP
             )
         """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ab_sync
+            ON attendance_buffer (sync_status, created_at)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ab_worker_date
+            ON attendance_buffer (worker_id, attendance_date)
+        """)
+        # Open (not yet timed-out) pending rows — used by update_timeout
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_ab_pending_open
+            ON attendance_buffer (worker_id, attendance_date)
+            WHERE time_out IS NULL AND sync_status = 'pending'
+        """)
         
-        # Face cache
+        # Face cache (encoding_data = 128 × float32 raw bytes)
+        self._migrate_encoding_blobs(cursor)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS face_encodings_cache (
                 encoding_id INTEGER PRIMARY KEY,
                 worker_id INTEGER NOT NULL,
-                encoding_data TEXT NOT NULL,
+                encoding_data BLOB NOT NULL,
                 first_name TEXT,
                 last_name TEXT,
                 worker_code TEXT,
@@ -150,26 +525,78 @@ class SQLiteDatabase:
         """)
 
         conn.commit()
-        conn.close()
         logger.info("SQLite initialized")
+
+    def _migrate_encoding_blobs(self, cursor: sqlite3.Cursor) -> None:
+        """One-time rebuild of a legacy face cache that stored JSON text."""
+        columns = {
+            row[1]: row[2] for row in
+            cursor.execute("PRAGMA table_info(face_encodings_cache)")
+        }
+        if columns.get('encoding_data', 'BLOB').upper() == 'BLOB':
+            return
+
+        logger.info("Migrating face_encodings_cache to BLOB encodings...")
+        cursor.execute(
+            "ALTER TABLE face_encodings_cache "
+            "RENAME TO face_encodings_cache_old")
+        cursor.execute("""
+            CREATE TABLE face_encodings_cache (
+                encoding_id INTEGER PRIMARY KEY,
+                worker_id INTEGER NOT NULL,
+                encoding_data BLOB NOT NULL,
+                first_name TEXT,
+                last_name TEXT,
+                worker_code TEXT,
+                is_active INTEGER DEFAULT 1,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        old_rows = cursor.execute("""
+            SELECT encoding_id, worker_id, encoding_data, first_name,
+                   last_name, worker_code, is_active, updated_at
+            FROM face_encodings_cache_old
+        """).fetchall()
+        rows = []
+        for row in old_rows:
+            try:
+                blob = self._encoding_to_blob(row[2])
+            except (ValueError, TypeError) as e:
+                logger.error(f"Dropping unreadable cached encoding {row[0]}: {e}")
+                continue
+            rows.append((row[0], row[1], blob) + tuple(row[3:]))
+        cursor.executemany("""
+            INSERT INTO face_encodings_cache
+            (encoding_id, worker_id, encoding_data, first_name, last_name,
+             worker_code, is_active, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+        cursor.execute("DROP TABLE face_encodings_cache_old")
+
+    @staticmethod
+    def _encoding_to_blob(value: Any) -> sqlite3.Binary:
+        """Pack an encoding (JSON text, bytes or array) as float32 bytes."""
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return sqlite3.Binary(value)
+        if isinstance(value, str):
+            value = json.loads(value)
+        return sqlite3.Binary(np.asarray(value, dtype=np.float32).tobytes())
     
     def insert_attendance(self, worker_id: int, attendance_date: str, 
                          time_in: Optional[str] = None, 
                          time_out: Optional[str] = None,
                          status: str = 'present') -> int:
         """Insert attendance to buffer"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO attendance_buffer 
-            (worker_id, attendance_date, time_in, time_out, status)
-            VALUES (?, ?, ?, ?, ?)
-        """, (worker_id, attendance_date, time_in, time_out, status))
-        
-        last_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        params = (worker_id, attendance_date, time_in, time_out, status)
+        conn = self._conn()
+        with conn:
+            if HAS_RETURNING:
+                last_id = conn.execute(
+                    _SQL_INSERT_ATTENDANCE + " RETURNING id",
+                    params).fetchone()[0]
+            else:
+                last_id = conn.execute(
+                    _SQL_INSERT_ATTENDANCE, params).lastrowid
         
         logger.info(f"Buffered attendance for worker {worker_id}")
         return last_id
@@ -177,145 +604,105 @@ class SQLiteDatabase:
     def update_timeout(self, worker_id: int, attendance_date: str, 
                       time_out: str, hours_worked: float) -> bool:
         """Update time-out"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE attendance_buffer 
-            SET time_out = ?, hours_worked = ?
-            WHERE worker_id = ? AND attendance_date = ? 
-            AND time_out IS NULL AND sync_status = 'pending'
-        """, (time_out, hours_worked, worker_id, attendance_date))
-        
-        affected = cursor.rowcount
-        conn.commit()
-        conn.close()
+        conn = self._conn()
+        with conn:
+            cursor = conn.execute(
+                _SQL_UPDATE_TIMEOUT,
+                (time_out, hours_worked, worker_id, attendance_date))
+            affected = cursor.rowcount
         
         return affected > 0
     
-    def get_pending_records(self) -> List[Dict[str, Any]]:
-        """Get pending sync records"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM attendance_buffer 
-            WHERE sync_status = 'pending'
-            ORDER BY created_at ASC
-        """)
-        
-        records = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        
-        return records
+    def iter_pending_records(
+        self, limit: Optional[int] = None, chunk: int = 1000
+    ) -> Iterator[sqlite3.Row]:
+        """Yield pending sync records oldest-first, ``chunk`` rows at a time"""
+        cursor = self._conn().execute(
+            _SQL_GET_PENDING, (-1 if limit is None else limit,))
+        cursor.arraysize = chunk
+
+        try:
+            while rows := cursor.fetchmany():
+                yield from rows
+        finally:
+            cursor.close()
+
+    def get_pending_records(
+        self, limit: int = Config.SYNC_BATCH_SIZE
+    ) -> List[sqlite3.Row]:
+        """Get the oldest pending sync records (at most ``limit``)"""
+        return list(self.iter_pending_records(limit))
+
+    def count_pending_records(self) -> int:
+        """Count records still waiting to be synced"""
+        row = self._conn().execute(_SQL_COUNT_PENDING).fetchone()
+        return row[0]
     
-    def mark_synced(self, buffer_id: int) -> None:
-        """Mark as synced"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE attendance_buffer 
-            SET sync_status = 'synced', synced_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        """, (buffer_id,))
-        
-        conn.commit()
-        conn.close()
+    def mark_synced_many(self, buffer_ids: List[int]) -> None:
+        """Mark a batch of buffer rows as synced (one transaction)"""
+        if not buffer_ids:
+            return
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                _SQL_MARK_SYNCED, [(bid,) for bid in buffer_ids])
     
     def cache_face_encodings(self, encodings: List[Dict[str, Any]]) -> None:
-        """Cache face encodings"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM face_encodings_cache")
-        
-        for enc in encodings:
-            cursor.execute("""
-                INSERT INTO face_encodings_cache 
-                (encoding_id, worker_id, encoding_data, first_name, last_name, 
-                 worker_code, is_active)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                enc['encoding_id'], 
-                enc['worker_id'], 
-                enc['encoding_data'],
-                enc['first_name'], 
-                enc['last_name'], 
-                enc['worker_code'],
-                enc['is_active']
-            ))
+        """Sync the face cache to ``encodings`` (upsert changed rows, drop the rest)"""
+        rows = [
+            (enc['encoding_id'], enc['worker_id'],
+             self._encoding_to_blob(enc['encoding_data']),
+             enc['first_name'], enc['last_name'], enc['worker_code'],
+             enc['is_active'])
+            for enc in encodings
+        ]
+
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for i in range(0, len(rows), self.INSERT_BATCH_SIZE):
+                conn.executemany(
+                    _SQL_UPSERT_ENCODING, rows[i:i + self.INSERT_BATCH_SIZE])
+            conn.execute(
+                _SQL_DELETE_STALE_ENCODINGS,
+                (json.dumps([row[0] for row in rows]),))
         
-        conn.commit()
-        conn.close()
+        with self._enc_cache_lock:
+            self._enc_cache = None
         logger.info(f"Cached {len(encodings)} encodings")
     
-    def get_cached_encodings(self) -> List[Dict[str, Any]]:
-        """Get cached encodings"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT * FROM face_encodings_cache
-            WHERE is_active = 1
-        """)
-
-        encodings = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+    def get_cached_encodings(self) -> List[sqlite3.Row]:
+        """Get cached encodings (encoding_data as raw float32 bytes).
 
-        return encodings
+        Read from disk once and served from memory until the next
+        ``cache_face_encodings`` call.
+        """
+        with self._enc_cache_lock:
+            if self._enc_cache is None:
+                cursor = self._conn().execute(_SQL_GET_ENCODINGS)
+                rows: List[sqlite3.Row] = []
+                while batch := cursor.fetchmany(self.FETCH_BATCH_SIZE):
+                    rows.extend(batch)
+                self._enc_cache = rows
+            return list(self._enc_cache)
 
     def get_today_attendance(
         self, worker_id: int, today: str
     ) -> Optional[Dict[str, Any]]:
         """Get today's attendance from local buffer (offline mode)."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT id AS attendance_id, worker_id,
-                   attendance_date, time_in, time_out,
-                   status, hours_worked
-            FROM attendance_buffer
-            WHERE worker_id = ? AND attendance_date = ?
-            ORDER BY created_at DESC LIMIT 1
-        """, (worker_id, today))
+        cursor = self._conn().execute(_SQL_GET_TODAY, (worker_id, today))
 
         row = cursor.fetchone()
-        conn.close()
         return dict(row) if row else None
 
     def get_device_config(self, key: str) -> Optional[str]:
         """Get a device configuration value."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT value FROM device_config WHERE key = ?", (key,))
-        row = cursor.fetchone()
-        conn.close()
+        row = self._conn().execute(_SQL_GET_CONFIG, (key,)).fetchone()
         return row[0] if row else None
 
     def set_device_config(self, key: str, value: str) -> None:
         """Set a device configuration value."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO device_config (key, value, updated_at)
-            VALUES (?, ?, CURRENT_TIMESTAMP)
-        """, (key, value))
-        conn.commit()
-        conn.close()
-
-    def set_device_config(self, key: str, value: str) -> None:
-        """Set a device configuration value."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO device_config (key, value, updated_at)
-            VALUES (?, ?, CURRENT_TIMESTAMP)
-        """, (key, value))
-        conn.commit()
-        conn.close()
\ No newline at end of file
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(_SQL_SET_CONFIG, (key, value))
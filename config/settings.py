@@ -3,65 +3,79 @@
 TrackSite Attendance System — Configuration
 
 All settings can be overridden via environment variables or .env file.
+The environment is parsed once at import; ``Config`` is a frozen
+instance, so settings are read-only at runtime.
 """
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Tuple, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
-class Config:
+@dataclass(frozen=True, slots=True, kw_only=True)
+class _Config:
     """Configuration settings for TrackSite Facial Recognition System"""
 
     # ── Project / Device ──────────────────────────────────────
-    PROJECT_ID: Optional[int] = int(os.getenv('PROJECT_ID', '0')) or None
-    DEVICE_NAME: str = os.getenv('DEVICE_NAME', 'TrackSite-Device')
+    PROJECT_ID: Optional[int]
+    DEVICE_NAME: str
 
     # ── MySQL Database (Central Server) ───────────────────────
-    MYSQL_HOST: str = os.getenv('MYSQL_HOST', 'localhost')
-    MYSQL_PORT: int = int(os.getenv('MYSQL_PORT', '3306'))
-    MYSQL_USER: str = os.getenv('MYSQL_USER', 'root')
-    MYSQL_PASSWORD: str = os.getenv('MYSQL_PASSWORD', '')
-    MYSQL_DATABASE: str = os.getenv('MYSQL_DATABASE', 'construction_management')
+    MYSQL_HOST: str
+    MYSQL_PORT: int
+    MYSQL_USER: str
+    MYSQL_PASSWORD: str
+    MYSQL_DATABASE: str
+    MYSQL_SOCKET: str  # Used instead of TCP when host is local
+    MYSQL_POOL_SIZE: int = 5
+    MYSQL_CONNECT_TIMEOUT: int = 3
 
     # ── SQLite Database (Local Buffer) ────────────────────────
-    SQLITE_PATH: str = os.getenv('SQLITE_PATH', 'data/local.db')
+    SQLITE_PATH: str
+    SQLITE_MMAP_MB: int  # Memory-mapped I/O window; 0 disables
 
     # ── Face Recognition ──────────────────────────────────────
-    FACE_RECOGNITION_TOLERANCE: float = float(os.getenv('FACE_TOLERANCE', '0.5'))
+    FACE_RECOGNITION_TOLERANCE: float
     FACE_DETECTION_MODEL: str = 'hog'  # 'hog' for CPU, 'cnn' for GPU
     MIN_FACE_SIZE: Tuple[int, int] = (50, 50)
     RECOGNITION_SCALE: float = 0.35  # Downscale factor for speed
+    USE_FAISS: bool  # HNSW index for large rosters (needs faiss)
+    USE_OPENCL: bool  # OpenCL pre-scale for detection, if available
+    OPENCV_THREADS: int  # OpenCV worker threads; 0 keeps OpenCV's default
 
     # ── Anti-Accidental Safeguards ────────────────────────────
     #   STABILITY_SECONDS   — Worker must stay in detection zone this long
     #   COOLDOWN_SECONDS    — After recording, same worker blocked this long
     #   MIN_WORK_INTERVAL   — Minimum minutes between Time In and Time Out
-    STABILITY_SECONDS: float = float(os.getenv('STABILITY_SECONDS', '3.0'))
-    COOLDOWN_SECONDS: float = float(os.getenv('COOLDOWN_SECONDS', '60.0'))
-    MIN_WORK_INTERVAL_MINUTES: int = int(os.getenv('MIN_WORK_INTERVAL', '0'))
+    STABILITY_SECONDS: float
+    COOLDOWN_SECONDS: float
+    MIN_WORK_INTERVAL_MINUTES: int
     DUPLICATE_TIMEOUT_SECONDS: int = 30
 
     # ── Synchronization ──────────────────────────────────────
-    SYNC_INTERVAL_SECONDS: int = int(os.getenv('SYNC_INTERVAL', '300'))
-    SYNC_API_URL: str = os.getenv('SYNC_API_URL', '')
-    SYNC_API_KEY: str = os.getenv('SYNC_API_KEY', '')
+    SYNC_INTERVAL_SECONDS: int
+    SYNC_API_URL: str
+    SYNC_API_KEY: str
+    SYNC_BATCH_SIZE: int = 5000  # Buffer rows pushed per sync cycle
     MAX_RETRY_ATTEMPTS: int = 3
     RETRY_BACKOFF_MULTIPLIER: int = 2
 
     # ── Camera / Hardware ─────────────────────────────────────
-    CAMERA_INDEX: int = int(os.getenv('CAMERA_INDEX', '0'))
+    CAMERA_INDEX: int
     CAMERA_RESOLUTION: Tuple[int, int] = (640, 480)
     CAMERA_FRAMERATE: int = 30
     GPIO_TIMEOUT_BUTTON: Optional[int] = None
     GPIO_MODE_LED: Optional[int] = None
 
     # ── Display ───────────────────────────────────────────────
-    FULLSCREEN: bool = os.getenv('FULLSCREEN', 'false').lower() == 'true'
-    WINDOW_WIDTH: int = int(os.getenv('WINDOW_WIDTH', '1280'))
-    WINDOW_HEIGHT: int = int(os.getenv('WINDOW_HEIGHT', '800'))
+    FULLSCREEN: bool
+    WINDOW_WIDTH: int
+    WINDOW_HEIGHT: int
+    HIGH_QUALITY_DISPLAY: bool  # Lanczos preview scaling (slower)
     DISPLAY_FEEDBACK_SECONDS: int = 8
 
     # ── Attendance Logic (legacy compat) ──────────────────────
@@ -70,5 +84,50 @@ class Config:
     DISPLAY_FONT_SCALE: float = 1.5
 
     # ── Logging ───────────────────────────────────────────────
-    LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_LEVEL: str
     LOG_FILE: str = 'logs/system.log'
+
+    @classmethod
+    @lru_cache(maxsize=1)
+    def load(cls) -> '_Config':
+        """Build the settings from the environment (parsed once)."""
+        return cls(
+            PROJECT_ID=int(os.getenv('PROJECT_ID', '0')) or None,
+            DEVICE_NAME=os.getenv('DEVICE_NAME', 'TrackSite-Device'),
+
+            MYSQL_HOST=os.getenv('MYSQL_HOST', 'localhost'),
+            MYSQL_PORT=int(os.getenv('MYSQL_PORT', '3306')),
+            MYSQL_USER=os.getenv('MYSQL_USER', 'root'),
+            MYSQL_PASSWORD=os.getenv('MYSQL_PASSWORD', ''),
+            MYSQL_DATABASE=os.getenv('MYSQL_DATABASE', 'construction_management'),
+            MYSQL_SOCKET=os.getenv('MYSQL_SOCKET', '/var/run/mysqld/mysqld.sock'),
+
+            SQLITE_PATH=os.getenv('SQLITE_PATH', 'data/local.db'),
+            SQLITE_MMAP_MB=int(os.getenv('SQLITE_MMAP_MB', '256')),
+
+            FACE_RECOGNITION_TOLERANCE=float(os.getenv('FACE_TOLERANCE', '0.5')),
+            USE_FAISS=os.getenv('USE_FAISS', 'false').lower() == 'true',
+            USE_OPENCL=os.getenv('USE_OPENCL', 'false').lower() == 'true',
+            OPENCV_THREADS=int(os.getenv('OPENCV_THREADS', '2')),
+
+            STABILITY_SECONDS=float(os.getenv('STABILITY_SECONDS', '3.0')),
+            COOLDOWN_SECONDS=float(os.getenv('COOLDOWN_SECONDS', '60.0')),
+            MIN_WORK_INTERVAL_MINUTES=int(os.getenv('MIN_WORK_INTERVAL', '0')),
+
+            SYNC_INTERVAL_SECONDS=int(os.getenv('SYNC_INTERVAL', '300')),
+            SYNC_API_URL=os.getenv('SYNC_API_URL', ''),
+            SYNC_API_KEY=os.getenv('SYNC_API_KEY', ''),
+
+            CAMERA_INDEX=int(os.getenv('CAMERA_INDEX', '0')),
+
+            FULLSCREEN=os.getenv('FULLSCREEN', 'false').lower() == 'true',
+            WINDOW_WIDTH=int(os.getenv('WINDOW_WIDTH', '1280')),
+            WINDOW_HEIGHT=int(os.getenv('WINDOW_HEIGHT', '800')),
+            HIGH_QUALITY_DISPLAY=(
+                os.getenv('HIGH_QUALITY_DISPLAY', 'false').lower() == 'true'),
+
+            LOG_LEVEL=os.getenv('LOG_LEVEL', 'INFO'),
+        )
+
+
+Config = _Config.load()
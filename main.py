@@ -4,7 +4,7 @@ TrackSite Attendance System — Tkinter GUI Application
 Standalone facial recognition attendance for construction sites.
 
 Features:
-  • Live camera feed with face detection & landmarks
+  • Live camera feed with face detection
   • Automatic Time In / Time Out (no manual toggle)
   • Anti-accidental safeguards (stability check, cooldown, min interval)
   • Offline-first local SQLite with automatic sync
@@ -37,10 +37,13 @@ sys.stderr = _old_stderr
 
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from operator import itemgetter
 import os
 import logging
+from dataclasses import dataclass, field
 from datetime import datetime, date, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 # Ensure correct working directory (for .env loading)
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
@@ -96,22 +99,42 @@ STATUS_COLORS = {
 }
 
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  Idle preview throttling
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+IDLE_FRAME_MS       = 100       # Poll interval while the scene is static
+IDLE_THUMB_SIZE     = (32, 24)  # Thumbnail compared between frames
+IDLE_DIFF_THRESHOLD = 2.0       # Mean abs gray-level change counted as motion
+
+# Longest wait at shutdown for queued attendance writes and an
+# in-flight sync to finish
+SHUTDOWN_DRAIN_SECONDS = 5.0
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 #  Stability Tracker
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+@dataclass(slots=True)
 class StabilityTracker:
-    """Tracks how long a recognized face stays in the detection zone."""
+    """Tracks how long a recognized face stays in the detection zone.
 
-    def __init__(self):
-        self.worker_id: Optional[int] = None
-        self.worker_name: str = ''
-        self.worker_code: str = ''
-        self.first_seen: Optional[float] = None
-        self.last_seen: Optional[float] = None
-        self.frame_count: int = 0
-
-    def update(self, worker_id: int, name: str = '', code: str = ''):
-        now = time.time()
+    Timestamps are ``time.monotonic()`` values supplied by the caller,
+    read once per frame.
+    """
+
+    worker_id: Optional[int] = None
+    worker_name: str = ''
+    worker_code: str = ''
+    first_seen: Optional[float] = None
+    last_seen: Optional[float] = None
+    frame_count: int = 0
+    required: float = field(default_factory=lambda: Config.STABILITY_SECONDS)
+    _inv_required: float = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._inv_required = 1.0 / self.required if self.required > 0 else 0.0
+
+    def update(self, now: float, worker_id: int, name: str = '', code: str = ''):
         if worker_id != self.worker_id:
             self.worker_id = worker_id
             self.worker_name = name
@@ -131,18 +154,18 @@ class StabilityTracker:
 
     @property
     def duration(self) -> float:
-        if self.first_seen and self.last_seen:
+        if self.first_seen is not None and self.last_seen is not None:
             return self.last_seen - self.first_seen
         return 0.0
 
     def is_stable(self) -> bool:
-        return self.duration >= Config.STABILITY_SECONDS
+        return self.duration >= self.required
 
     @property
     def progress(self) -> float:
-        if Config.STABILITY_SECONDS <= 0:
+        if self.required <= 0:
             return 1.0
-        return min(1.0, self.duration / Config.STABILITY_SECONDS)
+        return min(1.0, self.duration * self._inv_required)
 
     @property
     def is_active(self) -> bool:
@@ -179,7 +202,7 @@ class AttendanceApp:
         self.current_faces: List[Dict[str, Any]] = []
         self.faces_lock = threading.Lock()
 
-        # Stability & cooldown
+        # Stability & cooldown (deadlines are time.monotonic() values)
         self.stability = StabilityTracker()
         self.cooldowns: Dict[int, float] = {}
         self.attendance_triggered_for: Optional[int] = None
@@ -187,15 +210,40 @@ class AttendanceApp:
         # Notification
         self.notification: Optional[Dict[str, Any]] = None
         self.notification_expiry: float = 0
-
-        # UI refs
+        # Last values applied to the detection-status widgets
+        # (title, color, progress, detail)
+        self._stab_shown: Tuple[Optional[str], Optional[str],
+                                Optional[float], Optional[str]] = (
+            None, None, None, None)
+        self._date_shown: Optional[str] = None  # Date label changes daily
+
+        # UI refs — the PhotoImage and its scratch buffers are reused
+        # across frames and only rebuilt when the display size changes
         self.photo_image = None
+        self._display_size: Optional[Tuple[int, int]] = None
+        self._bgr_buf: Optional[np.ndarray] = None
+        self._rgba_buf: Optional[np.ndarray] = None
+        self._rgba_view: Optional[Image.Image] = None
+        self._flip_buf: Optional[np.ndarray] = None
+        self._idle_thumb: Optional[np.ndarray] = None
+        self._frame_id = 0
         self.project_name = ''
         self.encoding_count = 0
         
         # Selected project
         self.selected_project_id: Optional[int] = None
         
+        # Single background thread for UI-driven MySQL reads
+        self._db_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='ui-db')
+        # Single long-lived worker for attendance writes and reloads,
+        # so they run one at a time instead of on a thread each
+        self._task_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='tasks')
+        self._last_task: Optional[Future] = None  # Tasks finish in order
+        # Set on shutdown; interval workers wait on it instead of sleeping
+        self._shutdown_event = threading.Event()
+
         # Attendance records cache
         self.attendance_records: List[Dict[str, Any]] = []
 
@@ -251,6 +299,7 @@ class AttendanceApp:
         self.attendance_refresh_thread.start()
 
         self._camera_loop()
+        self._update_clock()
 
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     #   DATABASE INITIALIZATION
@@ -310,7 +359,7 @@ class AttendanceApp:
                 project = self.mysql_db.fetch_one("""
                     SELECT project_id FROM projects 
                     WHERE project_id = %s AND is_archived = 0 AND status = 'active'
-                """, (saved_project,))
+                """, (saved_project,), retry=False)
                 if project:
                     self.selected_project_id = saved_project
                     return True
@@ -323,7 +372,7 @@ class AttendanceApp:
             FROM projects p
             WHERE is_archived = 0 AND status = 'active'
             ORDER BY project_name
-        """)
+        """, retry=False)
 
         if not projects:
             messagebox.showerror(
@@ -799,8 +848,7 @@ class AttendanceApp:
         # Hide placeholder
         self.camera_placeholder.place_forget()
 
-        # Initial summary and attendance records
-        self._update_summary()
+        # Initial attendance records (and summary counts)
         self._refresh_attendance_records()
 
         logger.info("Initialization complete")
@@ -812,7 +860,7 @@ class AttendanceApp:
         if project_id and self.mysql_db and self.mysql_db.is_connected:
             project = self.mysql_db.fetch_one(
                 "SELECT project_name FROM projects WHERE project_id = %s",
-                (project_id,))
+                (project_id,), retry=False)
             if project:
                 self.project_name = project['project_name']
                 self.project_label.config(
@@ -827,6 +875,14 @@ class AttendanceApp:
             return
 
         project_id = self.selected_project_id or Config.PROJECT_ID
+        self._run_db_query(
+            lambda: self._query_attendance_records(project_id),
+            self._apply_attendance_records)
+
+    def _query_attendance_records(
+        self, project_id: Optional[int]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch today's attendance rows (runs on the DB thread)."""
         today_str = date.today().isoformat()
         day_name = date.today().strftime('%A').lower()
 
@@ -834,6 +890,7 @@ class AttendanceApp:
             if project_id:
                 records = self.mysql_db.fetch_all("""
                     SELECT 
+                        a.worker_id,
                         CONCAT(w.first_name, ' ', w.last_name) as worker_name,
                         w.worker_code,
                         a.time_in,
@@ -860,10 +917,11 @@ class AttendanceApp:
                     AND pw.is_active = 1
                     GROUP BY a.attendance_id
                     ORDER BY a.created_at DESC
-                """, (today_str, day_name, today_str, project_id))
+                """, (today_str, day_name, today_str, project_id), strict=True)
             else:
                 records = self.mysql_db.fetch_all("""
                     SELECT 
+                        a.worker_id,
                         CONCAT(w.first_name, ' ', w.last_name) as worker_name,
                         w.worker_code,
                         a.time_in,
@@ -887,13 +945,19 @@ class AttendanceApp:
                     AND a.is_archived = 0
                     GROUP BY a.attendance_id
                     ORDER BY a.created_at DESC
-                """, (today_str, day_name, today_str))
+                """, (today_str, day_name, today_str), strict=True)
 
-            self.attendance_records = records if records else []
-            self._update_attendance_table()
+            # None (failed query) keeps the table and counts as they are
+            return records
 
         except Exception as e:
             logger.error(f"Failed to refresh attendance records: {e}")
+            return None
+
+    def _apply_attendance_records(self, records: List[Dict[str, Any]]):
+        self.attendance_records = records
+        self._update_attendance_table()
+        self._apply_summary(records)
 
     def _update_attendance_table(self):
         """Update the treeview with current attendance records."""
@@ -966,9 +1030,8 @@ class AttendanceApp:
         """Background thread to periodically refresh attendance records."""
         logger.info("Attendance refresh worker started")
         
-        while self.is_running:
-            time.sleep(30)  # Refresh every 30 seconds
-            
+        # Refresh every 30 seconds
+        while not self._shutdown_event.wait(30):
             try:
                 self.root.after(0, self._refresh_attendance_records)
             except Exception as e:
@@ -984,62 +1047,117 @@ class AttendanceApp:
             return
 
         if self.camera:
-            ret, frame = self.camera.read_frame()
-            if ret and frame is not None:
-                frame = cv2.flip(frame, 1)
-                display = frame.copy()
-
+            # Only redraw when the camera has produced a new frame; the
+            # shared read-only frame is mirrored straight into a reused
+            # buffer, so no per-tick copy or allocation is made
+            self._frame_id, frame = self.camera.wait_frame(
+                self._frame_id, timeout=0)
+            if frame is not None:
                 # Read latest recognition results
                 with self.faces_lock:
                     faces = list(self.current_faces)
+                now = time.monotonic()
 
-                # Draw face overlays
-                self._draw_faces(display, faces)
-
-                # Update stability tracking
-                self._update_stability(faces)
-
-                # Convert BGR → RGB → PIL → PhotoImage
-                rgb = cv2.cvtColor(display, cv2.COLOR_BGR2RGB)
-                pil_img = Image.fromarray(rgb)
-
+                # Fit to the label, keeping aspect ratio
+                fh, fw = frame.shape[:2]
+                nw, nh = fw, fh
                 try:
                     cw = self.camera_label.winfo_width()
                     ch = self.camera_label.winfo_height()
                     if cw > 10 and ch > 10:
-                        fh, fw = frame.shape[:2]
                         scale = min(cw / fw, ch / fh)
                         nw, nh = int(fw * scale), int(fh * scale)
-                        pil_img = pil_img.resize((nw, nh), Image.LANCZOS)
-                except Exception:
-                    pass
+                except tk.TclError:
+                    return
+
+                # Idle: nobody in view and the scene hasn't changed —
+                # keep the last picture and poll at a lower rate
+                if (self._scene_unchanged(frame) and not faces
+                        and self._display_size == (nw, nh)):
+                    self._update_stability(faces, now)
+                    self.root.after(IDLE_FRAME_MS, self._camera_loop)
+                    return
+
+                if (self._flip_buf is None
+                        or self._flip_buf.shape != frame.shape):
+                    self._flip_buf = np.empty_like(frame)
+                display = cv2.flip(frame, 1, dst=self._flip_buf)
+
+                # Draw face overlays
+                self._draw_faces(display, faces, now)
+
+                # Update stability tracking
+                self._update_stability(faces, now)
 
-                self.photo_image = ImageTk.PhotoImage(pil_img)
                 try:
-                    self.camera_label.config(image=self.photo_image)
+                    if self._display_size != (nw, nh):
+                        self._alloc_display(nw, nh)
+
+                    # Resize into the preallocated buffer
+                    if Config.HIGH_QUALITY_DISPLAY:
+                        interp = cv2.INTER_LANCZOS4
+                    elif nw < fw:
+                        interp = cv2.INTER_AREA
+                    else:
+                        interp = cv2.INTER_LINEAR
+                    cv2.resize(display, (nw, nh), dst=self._bgr_buf,
+                               interpolation=interp)
+                    # Channel swap into the RGBA buffer that _rgba_view
+                    # wraps, then push it straight into the Tk photo
+                    cv2.cvtColor(self._bgr_buf, cv2.COLOR_BGR2RGBA,
+                                 dst=self._rgba_buf)
+                    self.photo_image.paste(self._rgba_view)
                 except tk.TclError:
                     return
 
-        # Update clock
-        self._update_clock()
-
         self.root.after(33, self._camera_loop)
 
+    def _scene_unchanged(self, frame: np.ndarray) -> bool:
+        """True if the frame barely differs from the last one drawn.
+
+        Compares 32×24 gray thumbnails by mean absolute difference rather
+        than an exact hash, since sensor noise changes a few pixel values
+        on every frame. The reference only moves when a frame is drawn,
+        so slow drift still triggers a redraw eventually.
+        """
+        thumb = cv2.cvtColor(
+            cv2.resize(frame, IDLE_THUMB_SIZE, interpolation=cv2.INTER_AREA),
+            cv2.COLOR_BGR2GRAY)
+        if (self._idle_thumb is not None
+                and cv2.absdiff(thumb, self._idle_thumb).mean()
+                < IDLE_DIFF_THRESHOLD):
+            return True
+        self._idle_thumb = thumb
+        return False
+
+    def _alloc_display(self, width: int, height: int):
+        """(Re)build the display PhotoImage and its scratch buffers.
+
+        ``_rgba_view`` is a PIL image sharing ``_rgba_buf``'s memory
+        (RGBA raw mode maps the buffer instead of copying), so no PIL
+        image is created per frame.
+        """
+        self._bgr_buf = np.empty((height, width, 3), dtype=np.uint8)
+        self._rgba_buf = np.empty((height, width, 4), dtype=np.uint8)
+        self._rgba_view = Image.frombuffer(
+            'RGBA', (width, height), self._rgba_buf, 'raw', 'RGBA', 0, 1)
+        self.photo_image = ImageTk.PhotoImage(
+            Image.new('RGB', (width, height)))
+        self.camera_label.config(image=self.photo_image)
+        self._display_size = (width, height)
+
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     #   FACE DRAWING
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-    def _draw_faces(self, frame, faces):
-        """Draw face boxes, names, and landmark mesh."""
+    def _draw_faces(self, frame, faces, now: float):
+        """Draw face boxes and names."""
         for face in faces:
             top, right, bottom, left = face['box']
             worker_id = face.get('worker_id')
             name = face.get('name', 'Unknown')
-            landmarks = face.get('landmarks', {})
 
             if worker_id:
-                in_cooldown = (
-                    worker_id in self.cooldowns
-                    and time.time() < self.cooldowns[worker_id])
+                in_cooldown = now < self.cooldowns.get(worker_id, 0.0)
                 color = (150, 150, 150) if in_cooldown else (0, 255, 0)
             else:
                 color = (0, 0, 255)
@@ -1059,54 +1177,48 @@ class AttendanceApp:
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     #   STABILITY TRACKING & ATTENDANCE TRIGGER
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-    def _update_stability(self, faces):
-        """Track face stability and trigger attendance when ready."""
+    def _update_stability(self, faces, now: float):
+        """Track face stability and trigger attendance when ready.
+
+        ``now`` is the tick's ``time.monotonic()`` reading.
+        """
         recognized = [f for f in faces if f.get('worker_id')]
 
         if recognized:
             # Pick the primary (largest) face
-            primary = max(
-                recognized,
-                key=lambda f: (
-                    (f['box'][2] - f['box'][0])
-                    * (f['box'][1] - f['box'][3])
-                ),
-            )
+            primary = max(recognized, key=itemgetter('area'))
             worker_id = primary['worker_id']
             worker_name = primary.get('name', '')
             worker_code = primary.get('worker_code', '')
 
             # Cooldown check
-            if (worker_id in self.cooldowns
-                    and time.time() < self.cooldowns[worker_id]):
-                remaining = self.cooldowns[worker_id] - time.time()
+            remaining = self.cooldowns.get(worker_id, 0.0) - now
+            if remaining > 0:
                 self._update_stability_ui(
-                    worker_name, 0.0,
+                    now, worker_name, 0.0,
                     f"Cooldown: {int(remaining)}s remaining",
                     TEXT_SEC)
                 return
 
             # Update tracker
-            self.stability.update(worker_id, worker_name, worker_code)
+            self.stability.update(now, worker_id, worker_name, worker_code)
             progress = self.stability.progress
             dur = self.stability.duration
-            req = Config.STABILITY_SECONDS
+            req = self.stability.required
 
             if self.stability.is_stable():
                 if self.attendance_triggered_for != worker_id:
                     self.attendance_triggered_for = worker_id
                     self._process_attendance(primary)
                 self._update_stability_ui(
-                    worker_name, 1.0, "Processing…", GOLD)
+                    now, worker_name, 1.0, "Processing…", GOLD)
             else:
                 self._update_stability_ui(
-                    worker_name, progress,
+                    now, worker_name, progress,
                     f"Hold steady: {dur:.1f}s / {req:.1f}s",
                     SUCCESS)
         else:
-            now = time.time()
             if (self.stability.is_active
-                    and self.stability.last_seen
                     and now - self.stability.last_seen > 1.5):
                 self.stability.reset()
                 self.attendance_triggered_for = None
@@ -1115,28 +1227,48 @@ class AttendanceApp:
                 unknown = [f for f in faces if not f.get('worker_id')]
                 if unknown:
                     self._update_stability_ui(
-                        "Unknown person", 0.0,
+                        now, "Unknown person", 0.0,
                         "Face not recognized", DANGER)
                 else:
                     self._update_stability_ui(
-                        "No face detected", 0.0,
+                        now, "No face detected", 0.0,
                         "Waiting for worker…", TEXT_SEC)
 
     def _update_stability_ui(
-        self, name: str, progress: float,
+        self, now: float, name: str, progress: float,
         text: str, color: str
     ):
         # Don't overwrite active notification (e.g. TIME IN / TIME OUT result)
-        if time.time() < self.notification_expiry:
+        if now < self.notification_expiry:
             return
+        self._set_stability_widgets(name, color, progress, text)
+
+    def _set_stability_widgets(
+        self, title: str, color: str, progress: float, detail: str
+    ):
+        """Apply detection-status values, skipping unchanged widgets.
+
+        Called every camera tick; each Tk ``config``/``place`` is a Tcl
+        round-trip, so only values that differ from the last applied
+        ones are pushed.
+        """
+        last_title, last_color, last_progress, last_detail = self._stab_shown
         try:
-            self.stab_name_label.config(text=name, fg=color)
-            self.stab_bar_fill.config(bg=color)
-            self.stab_bar_fill.place(
-                x=0, y=0, relheight=1.0, relwidth=progress)
-            self.stab_text_label.config(text=text)
+            if (title, color) != (last_title, last_color):
+                self.stab_name_label.config(text=title, fg=color)
+            if color != last_color:
+                self.stab_bar_fill.config(bg=color)
+            if (last_progress is None
+                    or abs(progress - last_progress) > 0.01
+                    or (progress in (0.0, 1.0) and progress != last_progress)):
+                self.stab_bar_fill.place(
+                    x=0, y=0, relheight=1.0, relwidth=progress)
+                last_progress = progress
+            if detail != last_detail:
+                self.stab_text_label.config(text=detail)
         except tk.TclError:
-            pass
+            return
+        self._stab_shown = (title, color, last_progress, detail)
 
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     #   ATTENDANCE PROCESSING
@@ -1156,7 +1288,7 @@ class AttendanceApp:
 
             # Set cooldown
             self.cooldowns[worker_id] = (
-                time.time() + Config.COOLDOWN_SECONDS)
+                time.monotonic() + Config.COOLDOWN_SECONDS)
 
             # Format notification
             action = result.get('action', '')
@@ -1193,82 +1325,81 @@ class AttendanceApp:
                 }
 
             self.root.after(0, lambda: self._show_notification(notif))
-            self.root.after(200, self._update_summary)
             self.root.after(500, self._refresh_attendance_records)
 
-        threading.Thread(target=do_process, daemon=True).start()
+        self._submit_task(do_process)
 
     def _show_notification(self, notif: Dict[str, Any]):
         """Display notification feedback in the detection status area."""
         self.notification = notif
         self.notification_expiry = (
-            time.time() + Config.DISPLAY_FEEDBACK_SECONDS)
+            time.monotonic() + Config.DISPLAY_FEEDBACK_SECONDS)
 
         ntype = notif.get('type', 'error')
         colors = STATUS_COLORS.get(ntype, STATUS_COLORS['error'])
 
+        # Update the detection status to show feedback
+        self._set_stability_widgets(
+            f"{colors['icon']} {notif['title']}", colors['fg'],
+            1.0, notif.get('detail', ''))
+
+    def _apply_summary(self, records: List[Dict[str, Any]]):
+        """Today's present/completed counts, derived from the table rows.
+
+        Same filters as the records query, so no separate aggregate
+        query is needed and the counts always match the table.
+        """
+        present = {r['worker_id'] for r in records}
+        completed = {r['worker_id'] for r in records
+                     if r.get('time_out') is not None}
         try:
-            fg = colors['fg']
-            icon = colors['icon']
-
-            # Update the detection status to show feedback
-            self.stab_name_label.config(
-                text=f"{icon} {notif['title']}", fg=fg)
-            self.stab_text_label.config(
-                text=notif.get('detail', ''))
-            self.stab_bar_fill.config(bg=fg)
-            self.stab_bar_fill.place(x=0, y=0, relheight=1.0, relwidth=1.0)
+            self.present_label.config(text=str(len(present)))
+            self.completed_label.config(text=str(len(completed)))
         except tk.TclError:
             pass
 
-    def _update_summary(self):
-        """Refresh today's attendance counts."""
-        if not self.mysql_db or not self.mysql_db.is_connected:
-            return
-
-        project_id = self.selected_project_id or Config.PROJECT_ID
+    def _run_db_query(self, query, apply):
+        """Run ``query()`` on the DB thread, then ``apply(result)`` on Tk.
+
+        Keeps MySQL latency off the main loop. A ``None`` result (no
+        data or an already-logged error) is not applied.
+        """
+        def done(future):
+            if future.cancelled():
+                return  # Dropped at shutdown
+            error = future.exception()
+            if error is not None:
+                logger.error(f"Background query failed: {error}")
+                return
+            result = future.result()
+            if result is None:
+                return
+            try:
+                self.root.after(0, apply, result)
+            except (RuntimeError, tk.TclError):
+                pass  # Tk already torn down
 
         try:
-            today_str = date.today().isoformat()
+            self._db_executor.submit(query).add_done_callback(done)
+        except RuntimeError:
+            pass  # Executor shut down
 
-            if project_id:
-                row = self.mysql_db.fetch_one("""
-                    SELECT
-                        COUNT(DISTINCT a.worker_id)
-                            AS present_count,
-                        COUNT(DISTINCT CASE
-                            WHEN a.time_out IS NOT NULL
-                            THEN a.worker_id END)
-                            AS completed_count
-                    FROM attendance a
-                    JOIN project_workers pw
-                        ON a.worker_id = pw.worker_id
-                    WHERE a.attendance_date = %s
-                    AND a.is_archived = 0
-                    AND pw.project_id = %s
-                    AND pw.is_active = 1
-                """, (today_str, project_id))
-            else:
-                row = self.mysql_db.fetch_one("""
-                    SELECT
-                        COUNT(DISTINCT worker_id)
-                            AS present_count,
-                        COUNT(DISTINCT CASE
-                            WHEN time_out IS NOT NULL
-                            THEN worker_id END)
-                            AS completed_count
-                    FROM attendance
-                    WHERE attendance_date = %s
-                    AND is_archived = 0
-                """, (today_str,))
-
-            if row:
-                self.present_label.config(
-                    text=str(row['present_count']))
-                self.completed_label.config(
-                    text=str(row['completed_count']))
-        except Exception as e:
-            logger.error(f"Failed to update summary: {e}")
+    def _submit_task(self, task):
+        """Queue ``task()`` on the background task worker.
+
+        Tasks run one at a time; an exception is logged rather than
+        left unseen on the future.
+        """
+        def done(future):
+            error = future.exception()
+            if error is not None:
+                logger.error(f"Background task failed: {error}")
+
+        try:
+            self._last_task = self._task_executor.submit(task)
+        except RuntimeError:
+            return  # Executor shut down
+        self._last_task.add_done_callback(done)
 
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     #   BACKGROUND WORKERS
@@ -1277,26 +1408,29 @@ class AttendanceApp:
         """Background thread — runs face recognition at ~10 fps."""
         logger.info("Recognition worker started")
 
+        last_id = 0
         while self.is_running:
             if not self.camera:
                 time.sleep(0.5)
                 continue
 
-            ret, frame = self.camera.read_frame()
-            if not ret or frame is None:
-                time.sleep(0.1)
+            # Always take the newest frame; anything older is dropped
+            last_id, frame = self.camera.wait_frame(last_id)
+            if frame is None:
                 continue
 
-            frame = cv2.flip(frame, 1)
+            started = time.monotonic()
 
             try:
-                faces = self.face_recognizer.detect_and_recognize(frame)
+                faces = self.face_recognizer.detect_and_recognize(
+                    frame, mirror=True)
                 with self.faces_lock:
                     self.current_faces = faces
             except Exception as e:
                 logger.error(f"Recognition error: {e}")
 
-            time.sleep(0.1)  # ~10 recognition fps
+            # Cap at ~10 recognition fps; slower passes don't sleep at all
+            time.sleep(max(0.0, 0.1 - (time.monotonic() - started)))
 
         logger.info("Recognition worker stopped")
 
@@ -1306,29 +1440,24 @@ class AttendanceApp:
 
         project_id = self.selected_project_id or Config.PROJECT_ID
 
-        while self.is_running:
-            time.sleep(Config.SYNC_INTERVAL_SECONDS)
-
+        while not self._shutdown_event.wait(Config.SYNC_INTERVAL_SECONDS):
+            # Label changes for this tick, handed to Tk in one callback
+            updates: Dict[str, Dict[str, Any]] = {}
             try:
                 # Try reconnecting if disconnected
                 if self.mysql_db and not self.mysql_db.is_connected:
                     if self.mysql_db.connect():
                         logger.info("MySQL reconnected")
-                        self.root.after(
-                            0,
-                            lambda: self.connection_label.config(
-                                text="● Online", fg=SUCCESS))
+                        updates['connection_label'] = {
+                            'text': "● Online", 'fg': SUCCESS}
                         # Reload encodings on reconnect
                         try:
                             count = (
                                 self.face_recognizer.load_encodings(
                                     project_id=project_id))
                             self.encoding_count = count
-                            self.root.after(
-                                0,
-                                lambda c=count:
-                                    self.encoding_label.config(
-                                        text=f"Faces: {c}"))
+                            updates['encoding_label'] = {
+                                'text': f"Faces: {count}"}
                         except Exception:
                             pass
 
@@ -1337,29 +1466,51 @@ class AttendanceApp:
                     result = self.sync_manager.sync_all()
                     synced = result.get('synced', 0)
                     pending = result.get('pending', 0)
+                    self.sqlite_db.checkpoint()
 
                     status = (f"Sync: {pending} pending"
                               if pending > 0
                               else "Sync: OK")
-                    self.root.after(
-                        0,
-                        lambda s=status:
-                            self.sync_label.config(text=s))
+                    updates['sync_label'] = {'text': status}
             except Exception as e:
                 logger.error(f"Sync error: {e}")
 
+            if updates:
+                self.root.after(0, self._apply_label_updates, updates)
+
         logger.info("Sync worker stopped")
 
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     #   UI UPDATES
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+    def _apply_label_updates(self, updates: Dict[str, Dict[str, Any]]):
+        """Apply a worker's batched label changes, skipping no-ops."""
+        try:
+            for name, options in updates.items():
+                label = getattr(self, name)
+                if any(label.cget(k) != v for k, v in options.items()):
+                    label.config(**options)
+        except tk.TclError:
+            pass  # Window already closed
+
     def _update_clock(self):
+        """Refresh the clock once per second (own after() chain)."""
+        if not self.is_running:
+            return
+
         now = datetime.now()
+        date_str = now.strftime('%B %d, %Y')
         try:
             self.time_label.config(text=now.strftime('%I:%M:%S %p'))
-            self.date_label.config(text=now.strftime('%B %d, %Y'))
+            if date_str != self._date_shown:
+                self.date_label.config(text=date_str)
+                self._date_shown = date_str
         except tk.TclError:
-            pass
+            return
+
+        # Re-arm just after the next second boundary
+        self.root.after(
+            1000 - now.microsecond // 1000 + 5, self._update_clock)
 
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     #   ACTIONS
@@ -1392,7 +1543,7 @@ class AttendanceApp:
             except Exception as e:
                 logger.error(f"Reload failed: {e}")
 
-        threading.Thread(target=reload, daemon=True).start()
+        self._submit_task(reload)
 
     def _change_project(self):
         """Open project selection dialog to change the current project."""
@@ -1408,12 +1559,36 @@ class AttendanceApp:
             self._load_project_info()
             self._reload_encodings()
             self._refresh_attendance_records()
-            self._update_summary()
             logger.info(f"Switched to project ID: {self.selected_project_id}")
 
     def _shutdown(self):
+        if self._shutdown_event.is_set():
+            return  # Re-entered from the Tk events pumped below
         logger.info("Shutting down...")
         self.is_running = False
+        self._shutdown_event.set()
+
+        self._db_executor.shutdown(wait=False, cancel_futures=True)
+
+        # Let queued attendance writes and an in-flight sync (the sync
+        # worker wakes on the event) finish before the databases close.
+        # Tk keeps pumping meanwhile: root.after from either worker
+        # thread blocks until the main loop services it, so a plain
+        # join would stall.
+        self._task_executor.shutdown(wait=False)
+
+        def busy():
+            if self._last_task is not None and not self._last_task.done():
+                return True
+            return self.sync_thread is not None and self.sync_thread.is_alive()
+
+        deadline = time.monotonic() + SHUTDOWN_DRAIN_SECONDS
+        while busy() and time.monotonic() < deadline:
+            try:
+                self.root.update()
+            except tk.TclError:
+                break
+            time.sleep(0.01)
 
         if self.camera:
             try:
@@ -1427,6 +1602,12 @@ class AttendanceApp:
             except Exception:
                 pass
 
+        if self.sqlite_db:
+            try:
+                self.sqlite_db.close()
+            except Exception:
+                pass
+
         try:
             self.root.destroy()
         except Exception:
@@ -4,8 +4,11 @@ import time
 import sys
 import cv2
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, Any, Tuple
+from functools import lru_cache
+from operator import itemgetter
+from typing import Optional, Dict, Any, Tuple, List
 from config.settings import Config
 from config.database import MySQLDatabase, SQLiteDatabase
 from models.face_recognizer import FaceRecognizer
@@ -27,6 +30,52 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+BANNER_HEIGHT = 90
+
+
+@lru_cache(maxsize=64)
+def _wrap_text(text: str, max_width: int, scale: float, thickness: int) -> Tuple[str, ...]:
+    """Greedy word-wrap measuring each word once (O(n) getTextSize calls)"""
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    words = text.split()
+    if not words:
+        return ()
+    word_w = [cv2.getTextSize(word, font, scale, thickness)[0][0] for word in words]
+    space_w = cv2.getTextSize(' ', font, scale, thickness)[0][0]
+
+    lines = []
+    start, cur_w = 0, word_w[0]
+    for i in range(1, len(words)):
+        if cur_w + space_w + word_w[i] >= max_width:
+            lines.append(' '.join(words[start:i]))
+            start, cur_w = i, word_w[i]
+        else:
+            cur_w += space_w + word_w[i]
+    lines.append(' '.join(words[start:]))
+    return tuple(lines)
+
+
+@lru_cache(maxsize=64)
+def _render_banner(width: int, color: Tuple[int, int, int],
+                   title: str, detail: str, detail2: str) -> np.ndarray:
+    """Render the result banner once; the frame loop just copies it in."""
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    banner = np.empty((BANNER_HEIGHT, width, 3), dtype=np.uint8)
+    banner[:] = color
+
+    cv2.putText(banner, title, (12, 28), font, 0.9, (255, 255, 255), 2)
+    if detail2:
+        cv2.putText(banner, detail, (12, 54), font, 0.6, (230, 230, 230), 1)
+        cv2.putText(banner, detail2, (12, 76), font, 0.5, (200, 200, 200), 1)
+    else:
+        # Free-text messages get both detail rows
+        for y, line in zip((54, 76), _wrap_text(detail, width - 24, 0.6, 1)):
+            cv2.putText(banner, line, (12, y), font, 0.6, (230, 230, 230), 1)
+
+    banner.flags.writeable = False  # Shared between calls
+    return banner
+
+
 class AttendanceSystem:
     """Main attendance system - AUTO-RECORD mode (no confirmation needed)"""
 
@@ -50,16 +99,29 @@ class AttendanceSystem:
         # System state
         self.is_running = False
         self.timeout_mode = False
-        self.last_recognition_time: Optional[datetime] = None
 
-        # Performance optimization
-        self.target_fps = 30
-        self.frame_time = 1.0 / self.target_fps
-        self.skip_frames = 1  # Process EVERY frame for smooth tracking
+        # Performance optimization — the display loop is paced by the
+        # camera (wait_frame) and mirrors into a reused buffer
         self.frame_counter = 0
+        self._frame_id = 0
+        self._flip_buf: Optional[np.ndarray] = None
+        # Status bar text, rebuilt when its inputs or the second change
+        self._status_key: Optional[Tuple[int, bool, bool]] = None
+        self._status_text = ""
+
+        # Recognition runs on its own thread; the display loop only draws
+        # the latest published results
+        self.current_faces: List[Dict[str, Any]] = []
+        # True while detection has lost the faces above; they stay on
+        # screen, faded, until something is detected again
+        self.faces_stale = False
+        self.faces_lock = threading.Lock()
+        self.recognition_thread: Optional[threading.Thread] = None
 
         # Threading
         self.sync_thread: Optional[threading.Thread] = None
+        # Set on shutdown; the sync worker waits on it instead of sleeping
+        self._shutdown_event = threading.Event()
 
         # Success display overlay (non-blocking)
         self.success_overlay: Optional[Dict[str, Any]] = None
@@ -67,8 +129,12 @@ class AttendanceSystem:
         self.overlay_end_time: Optional[float] = None
 
         # Auto-record system (no confirmation needed)
-        self.last_recognized_worker_id: Optional[int] = None
+        # worker_id -> time.monotonic() until which repeat scans are ignored
+        self.cooldowns: Dict[int, float] = {}
         self.recognition_cooldown = 3.0  # Prevent duplicate scans within 3 seconds
+        # Attendance writes run one at a time off the recognition thread
+        self._attendance_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='attendance')
 
         # Lightweight UI params
         self.font = cv2.FONT_HERSHEY_SIMPLEX
@@ -160,38 +226,31 @@ class AttendanceSystem:
         self.sync_thread = threading.Thread(target=self._sync_worker, daemon=True)
         self.sync_thread.start()
 
+        # Start background recognition
+        self.recognition_thread = threading.Thread(
+            target=self._recognition_worker, daemon=True)
+        self.recognition_thread.start()
+
         try:
             while self.is_running:
-                loop_start = time.time()
-
-                # Read frame
-                ret, frame = self.camera.read_frame()
-                if not ret or frame is None:
+                # Block until the camera publishes a newer frame
+                self._frame_id, frame = self.camera.wait_frame(self._frame_id)
+                if frame is None:
                     logger.error("Failed to read camera frame")
-                    time.sleep(0.1)
+                    if not self._handle_key(self.display.wait_key(1)):
+                        break
                     continue
 
-                # Mirror for natural preview
-                frame = cv2.flip(frame, 1)
+                # Mirror for natural preview (also our writable copy)
+                if self._flip_buf is None or self._flip_buf.shape != frame.shape:
+                    self._flip_buf = np.empty_like(frame)
+                frame = cv2.flip(frame, 1, dst=self._flip_buf)
                 self.frame_counter += 1
 
-                # Recognition (every N frames) - ALWAYS runs
-                if self.frame_counter % self.skip_frames == 0:
-                    try:
-                        worker_info, frame, face_box = self.face_recognizer.recognize_face(frame)
-                    except Exception:
-                        out = self.face_recognizer.recognize_face(frame)
-                        if isinstance(out, tuple) and len(out) >= 2:
-                            worker_info = out[0]
-                            frame = out[1]
-                            face_box = None
-                        else:
-                            worker_info = None
-                            face_box = None
-
-                    # AUTO-RECORD: Process attendance immediately when face recognized
-                    if worker_info and face_box:
-                        self._handle_recognition_auto(worker_info)
+                # Latest recognition results (from the recognition thread)
+                with self.faces_lock:
+                    faces, stale = self.current_faces, self.faces_stale
+                self._draw_faces(frame, faces, stale)
 
                 # Optimized status bar
                 status = self._get_status_text()
@@ -207,33 +266,23 @@ class AttendanceSystem:
                         font_scale=0.7
                     )
 
-                # Draw success banner
-                with self.overlay_lock:
-                    if self.success_overlay is not None:
-                        if time.time() < (self.overlay_end_time or 0):
-                            frame = self._draw_success_banner(frame, self.success_overlay)
-                        else:
-                            self.success_overlay = None
-                            self.overlay_end_time = None
+                # Draw success banner (the unlocked reference check keeps
+                # the lock off the loop while no banner is up)
+                if self.success_overlay is not None:
+                    with self.overlay_lock:
+                        if self.success_overlay is not None:
+                            if time.monotonic() < (self.overlay_end_time or 0):
+                                frame = self._draw_success_banner(frame, self.success_overlay)
+                            else:
+                                self.success_overlay = None
+                                self.overlay_end_time = None
 
                 # Display frame
                 self.display.show_frame(frame)
 
                 # Handle keyboard
-                key = self.display.wait_key(1)
-                if key == ord('q') or key == 27:
-                    logger.info("Quit key pressed")
+                if not self._handle_key(self.display.wait_key(1)):
                     break
-                elif key == ord('t'):
-                    self._toggle_timeout_mode()
-                elif key == ord('r'):
-                    self._reload_encodings()
-
-                # FPS limiter
-                next_frame = loop_start + self.frame_time
-                sleep_time = next_frame - time.time()
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
 
         except KeyboardInterrupt:
             logger.info("Keyboard interrupt received")
@@ -242,36 +291,119 @@ class AttendanceSystem:
         finally:
             self.shutdown()
 
-    def _handle_recognition_auto(self, worker_info: Dict[str, Any]):
+    def _handle_key(self, key: int) -> bool:
+        """Apply a key press; returns False when the user asked to quit"""
+        if key == ord('q') or key == 27:
+            logger.info("Quit key pressed")
+            return False
+        elif key == ord('t'):
+            self._toggle_timeout_mode()
+        elif key == ord('r'):
+            self._reload_encodings()
+        return True
+
+    def _recognition_worker(self):
+        """Background thread — detect/recognize on the newest frame only.
+
+        Keeps the display loop at full frame rate while detection runs
+        at whatever rate the CPU allows; frames captured in between are
+        skipped rather than queued.
+        """
+        logger.info("Recognition worker started")
+
+        last_id = 0
+        while self.is_running:
+            last_id, frame = self.camera.wait_frame(last_id)
+            if frame is None:
+                continue
+
+            try:
+                faces = self.face_recognizer.detect_and_recognize(
+                    frame, mirror=True)
+            except Exception as e:
+                logger.error(f"Recognition error: {e}")
+                faces = []
+
+            with self.faces_lock:
+                if faces:
+                    self.current_faces = faces
+                    self.faces_stale = False
+                else:
+                    self.faces_stale = True
+
+            # AUTO-RECORD: Process attendance immediately when face recognized
+            recognized = [f for f in faces if f.get('worker_id')]
+            if recognized:
+                self._handle_recognition_auto(
+                    max(recognized, key=itemgetter('area')))
+
+        logger.info("Recognition worker stopped")
+
+    def _draw_faces(self, frame: np.ndarray, faces: List[Dict[str, Any]],
+                    stale: bool = False):
+        """Draw recognition boxes and names onto the display frame.
+
+        ``stale`` faces (last known, detection lost them) are drawn
+        faded and thin.
+        """
+        for face in faces:
+            top, right, bottom, left = face['box']
+            if stale:
+                cv2.rectangle(frame, (left, top), (right, bottom), (0, 150, 0), 2)
+                cv2.putText(frame, face.get('name', ''), (left, max(25, top - 10)),
+                            self.font, 0.7, (0, 150, 0), 2)
+                continue
+            if face.get('worker_id'):
+                color, thickness, label = (0, 255, 0), 5, face.get('name', '')
+            else:
+                color, thickness, label = (0, 0, 255), 4, "Unknown"
+
+            cv2.rectangle(frame, (left, top), (right, bottom), color, thickness)
+
+            label_y = max(30, top - 10)
+            # Shadow for readability
+            cv2.putText(frame, label, (left + 2, label_y + 2),
+                        self.font, 0.9, (0, 0, 0), 4)
+            cv2.putText(frame, label, (left, label_y),
+                        self.font, 0.9, color, 2)
+
+    def _handle_recognition_auto(self, face: Dict[str, Any]):
         """AUTO-RECORD: Immediately process attendance without confirmation"""
-        now = datetime.now()
-        worker_id = worker_info.get('worker_id')
-
-        # Cooldown check - prevent duplicate scans
-        if self.last_recognized_worker_id == worker_id:
-            if self.last_recognition_time:
-                time_diff = (now - self.last_recognition_time).total_seconds()
-                if time_diff < self.recognition_cooldown:
-                    return  # Skip - too soon since last scan
-        
-        # Update tracking
-        self.last_recognition_time = now
-        self.last_recognized_worker_id = worker_id
-        
+        now = time.monotonic()
+        worker_id = face.get('worker_id')
+
+        # Cooldown check - prevent duplicate scans (per worker)
+        if now < self.cooldowns.get(worker_id, 0.0):
+            return  # Skip - too soon since last scan
+        self.cooldowns[worker_id] = now + self.recognition_cooldown
+
         # Process attendance immediately
-        worker_name = f"{worker_info.get('first_name','')} {worker_info.get('last_name','')}"
-        worker_code = worker_info.get('worker_code', 'N/A')
-        
+        worker_name = face.get('name', '')
+        worker_code = face.get('worker_code') or 'N/A'
+
         logger.info(f"Auto-recording attendance: {worker_name}")
-        
-        # Process attendance
-        result = self._process_attendance(worker_info)
-        
+
+        # The DB write runs on the attendance worker so detection
+        # keeps going; writes stay serialized in scan order
+        try:
+            self._attendance_executor.submit(
+                self._record_attendance, worker_id, worker_name, worker_code)
+        except RuntimeError:
+            pass  # Shutting down
+
+    def _record_attendance(self, worker_id: int, worker_name: str, worker_code: str):
+        """Log attendance and show the result (attendance worker thread)"""
+        try:
+            result = self._process_attendance(worker_id, worker_name)
+        except Exception as e:
+            logger.error(f"Attendance error: {e}")
+            return
+
         # Show result overlay
         self._show_result_overlay(result, worker_name, worker_id, worker_code)
 
-    def _draw_success_banner(self, frame: np.ndarray, overlay_data: Dict[str, Any]) -> np.ndarray:
-        """Success banner with time-in information"""
+    def _banner_text(self, overlay_data: Dict[str, Any]) -> Tuple[Tuple[int, int, int], str, str, str]:
+        """Banner colour and text lines for a recorded result"""
         result = overlay_data.get('result', {})
         worker_name = overlay_data.get('worker_name', '')
         worker_id = overlay_data.get('worker_id', 0)
@@ -279,9 +411,6 @@ class AttendanceSystem:
         timestamp = overlay_data.get('timestamp', datetime.now())
         action = result.get('action', '')
 
-        h, w = frame.shape[:2]
-        banner_h = 90
-
         if result.get('success'):
             if action == 'timeout':
                 color = (0, 100, 180)  # Blue for time-out
@@ -319,20 +448,17 @@ class AttendanceSystem:
                 detail = result.get('message', '')
                 detail2 = ""
 
-        # Solid banner
-        cv2.rectangle(frame, (0, 0), (w, banner_h), color, -1)
-
-        cv2.putText(frame, title, (12, 28), self.font, 0.9, (255, 255, 255), 2)
-        cv2.putText(frame, detail, (12, 54), self.font, 0.6, (230, 230, 230), 1)
-        if detail2:
-            cv2.putText(frame, detail2, (12, 76), self.font, 0.5, (200, 200, 200), 1)
+        return color, title, detail, detail2
 
+    def _draw_success_banner(self, frame: np.ndarray, overlay_data: Dict[str, Any]) -> np.ndarray:
+        """Success banner with time-in information (cached sprite blit)"""
+        w = frame.shape[1]
+        sprite = _render_banner(w, *overlay_data['banner'])
+        frame[:sprite.shape[0]] = sprite
         return frame
 
-    def _process_attendance(self, worker_info: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_attendance(self, worker_id: int, worker_name: str) -> Dict[str, Any]:
         """Process attendance"""
-        worker_id = worker_info['worker_id']
-        worker_name = f"{worker_info.get('first_name','')} {worker_info.get('last_name','')}"
 
         if self.timeout_mode:
             logger.info(f"Processing TIME-OUT for: {worker_name} (ID: {worker_id})")
@@ -368,10 +494,12 @@ class AttendanceSystem:
             'result': result,
             'timestamp': current_time
         }
+        # Text is fixed for the banner's lifetime; resolve it once
+        overlay_data['banner'] = self._banner_text(overlay_data)
 
         with self.overlay_lock:
             self.success_overlay = overlay_data
-            self.overlay_end_time = time.time() + 2.5
+            self.overlay_end_time = time.monotonic() + 2.5
 
     def _toggle_timeout_mode(self):
         """Toggle time-out mode"""
@@ -409,31 +537,26 @@ class AttendanceSystem:
             logger.warning(f"Reload failed: {e}")
 
     def _get_status_text(self) -> str:
-        """Get optimized status text"""
-        parts = []
-        
-        # Online/Offline status
-        parts.append("[ONLINE]" if (self.mysql_db and getattr(self.mysql_db, 'is_connected', False)) else "[OFFLINE]")
-        
-        # Mode
-        parts.append("TIME OUT" if self.timeout_mode else "TIME IN")
-        
-        # Current time in 12-hour format
-        now = datetime.now()
-        parts.append(now.strftime('%I:%M:%S %p'))
-        
-        # Full date format
-        parts.append(now.strftime('%B %d, %Y'))
+        """Get optimized status text (formatted at most once a second)"""
+        online = bool(self.mysql_db and getattr(self.mysql_db, 'is_connected', False))
+        key = (int(time.time()), online, self.timeout_mode)
+        if key == self._status_key:
+            return self._status_text
 
-        return " | ".join(parts)
+        # Online/Offline status, mode, 12-hour time and full date
+        now = datetime.now()
+        self._status_text = (
+            f"{'[ONLINE]' if online else '[OFFLINE]'} | "
+            f"{'TIME OUT' if self.timeout_mode else 'TIME IN'} | "
+            f"{now.strftime('%I:%M:%S %p')} | {now.strftime('%B %d, %Y')}")
+        self._status_key = key
+        return self._status_text
 
     def _sync_worker(self):
         """Background sync worker"""
         logger.info("Sync worker started")
 
-        while self.is_running:
-            time.sleep(Config.SYNC_INTERVAL_SECONDS)
-
+        while not self._shutdown_event.wait(Config.SYNC_INTERVAL_SECONDS):
             try:
                 if self.mysql_db and not getattr(self.mysql_db, 'is_connected', False):
                     if self.mysql_db.connect():
@@ -447,6 +570,7 @@ class AttendanceSystem:
                     result = self.sync_manager.sync_all()
                     if result.get('synced', 0) > 0:
                         logger.info(f"Synced {result['synced']} records")
+                    self.sqlite_db.checkpoint()
             except Exception as e:
                 logger.error(f"Sync error: {e}")
 
@@ -457,6 +581,13 @@ class AttendanceSystem:
         logger.info("Shutting down...")
 
         self.is_running = False
+        self._shutdown_event.set()
+
+        if self.recognition_thread:
+            self.recognition_thread.join(timeout=3)
+
+        # Let a queued attendance write finish before the DBs close
+        self._attendance_executor.shutdown(wait=True)
 
         if self.sync_thread:
             self.sync_thread.join(timeout=3)
@@ -485,6 +616,12 @@ class AttendanceSystem:
             except Exception:
                 pass
 
+        if self.sqlite_db:
+            try:
+                self.sqlite_db.close()
+            except Exception:
+                pass
+
         logger.info("Shutdown complete")
 
 
@@ -1,14 +1,49 @@
 import face_recognition
 import numpy as np
 import cv2
+import hashlib
 import json
 import logging
+from dataclasses import dataclass
 from typing import List, Tuple, Optional, Dict, Any
 from config.settings import Config
 from config.database import MySQLDatabase, SQLiteDatabase
 
+try:
+    import faiss
+    HAS_FAISS = True
+except ImportError:
+    HAS_FAISS = False
+
 logger = logging.getLogger(__name__)
 
+# Below this many known faces the matrix scan beats an ANN index
+FAISS_MIN_ENCODINGS = 128
+
+# Candidates taken from the 8-bit index and re-scored in float32
+FAISS_RERANK_K = 4
+
+
+@dataclass(frozen=True, slots=True)
+class _KnownFaces:
+    """Everything matching reads, published as one unit on reload.
+
+    Row ``i`` of ``encodings`` and ``sq_norms`` belongs to
+    ``metadata[i]``; readers take one reference and use only that.
+    """
+    encodings: np.ndarray  # (N, 128) float32, C-contiguous
+    sq_norms: np.ndarray   # (N,) float32, |row|²
+    index: Any             # FAISS HNSW index (large rosters only) or None
+    metadata: Tuple[Dict[str, Any], ...]
+    digest: Optional[bytes] = None  # Rows the above were built from
+
+
+_NO_FACES = _KnownFaces(
+    encodings=np.empty((0, 128), dtype=np.float32),
+    sq_norms=np.empty(0, dtype=np.float32),
+    index=None,
+    metadata=())
+
 
 class FaceRecognizer:
     """Optimized face recognition - smooth 30 FPS"""
@@ -16,18 +51,34 @@ class FaceRecognizer:
     def __init__(self, mysql_db: MySQLDatabase, sqlite_db: SQLiteDatabase):
         self.mysql_db = mysql_db
         self.sqlite_db = sqlite_db
-        self.known_encodings: List[np.ndarray] = []
-        self.known_metadata: List[Dict[str, Any]] = []
+        # Replaced wholesale by load_encodings, never mutated in place
+        self._known: _KnownFaces = _NO_FACES
         self.last_update: Optional[float] = None
         
         # Performance settings - OPTIMIZED for smooth tracking
         self.scale_factor = 0.35  # Further reduced for faster processing
         self.tolerance = 0.5
-        
-        # Cache last face locations to maintain smooth tracking
-        self.last_face_locations = []
-        self.last_face_names = []
-        self.last_face_ids = []  # Track worker IDs
+
+        # OpenCL (T-API) for the detection pre-scale, when built and enabled
+        self.use_opencl = Config.USE_OPENCL and cv2.ocl.haveOpenCL()
+        cv2.ocl.setUseOpenCL(self.use_opencl)
+        if Config.OPENCV_THREADS > 0:
+            cv2.setNumThreads(Config.OPENCV_THREADS)
+        # SIMD baseline/dispatch of this OpenCV build (e.g. NEON, AVX2)
+        logger.info(
+            f"OpenCV {cv2.__version__} | SIMD: {cv2.getCPUFeaturesLine()} | "
+            f"optimized: {cv2.useOptimized()} | OpenCL: {self.use_opencl} | "
+            f"threads: {cv2.getNumThreads()}")
+
+    @property
+    def known_encodings(self) -> np.ndarray:
+        """(N, 128) float32 matrix of the currently loaded faces"""
+        return self._known.encodings
+
+    @property
+    def known_metadata(self) -> Tuple[Dict[str, Any], ...]:
+        """Worker details for each row of ``known_encodings``"""
+        return self._known.metadata
     
     def load_encodings(self, project_id=None) -> int:
         """Load face encodings from database, optionally filtered by project."""
@@ -35,26 +86,42 @@ class FaceRecognizer:
 
         # Try MySQL first
         encodings = []
+        from_mysql = False
         if self.mysql_db and self.mysql_db.is_connected:
             encodings = self._load_from_mysql(project_id)
-            if encodings and self.sqlite_db:
-                self.sqlite_db.cache_face_encodings(encodings)
+            from_mysql = True
         else:
             # Fallback to SQLite
             if self.sqlite_db:
                 encodings = self.sqlite_db.get_cached_encodings()
                 logger.warning("Using cached encodings (offline)")
+
+        # Reloads ('r', reconnects) usually return the same rows; hashing
+        # them is far cheaper than re-parsing and rebuilding the matrix
+        digest = self._fingerprint(encodings)
+        if digest is not None and digest == self._known.digest:
+            logger.info(
+                f"Encodings unchanged; keeping {len(self._known.encodings)}")
+            return len(self._known.encodings)
+
+        if from_mysql and encodings and self.sqlite_db:
+            self.sqlite_db.cache_face_encodings(encodings)
         
         # Parse encodings
-        self.known_encodings = []
-        self.known_metadata = []
+        rows: List[np.ndarray] = []
+        metadata: List[Dict[str, Any]] = []
         
         for enc_data in encodings:
             try:
-                encoding_array = np.array(json.loads(enc_data['encoding_data']))
-                self.known_encodings.append(encoding_array)
+                raw = enc_data['encoding_data']
+                if isinstance(raw, bytes):
+                    # SQLite cache — zero-copy float32 view
+                    encoding_array = np.frombuffer(raw, dtype=np.float32)
+                else:
+                    encoding_array = np.asarray(json.loads(raw), dtype=np.float32)
+                rows.append(encoding_array)
                 
-                self.known_metadata.append({
+                metadata.append({
                     'worker_id': enc_data['worker_id'],
                     'first_name': enc_data['first_name'],
                     'last_name': enc_data['last_name'],
@@ -63,8 +130,110 @@ class FaceRecognizer:
             except Exception as e:
                 logger.error(f"Failed to parse encoding: {e}")
         
-        logger.info(f"Loaded {len(self.known_encodings)} encodings")
-        return len(self.known_encodings)
+        if rows:
+            matrix = np.ascontiguousarray(np.stack(rows), dtype=np.float32)
+        else:
+            matrix = np.empty((0, 128), dtype=np.float32)
+        known = _KnownFaces(
+            encodings=matrix,
+            sq_norms=np.einsum('ij,ij->i', matrix, matrix),
+            index=self._build_index(matrix),
+            metadata=tuple(metadata),
+            digest=digest)
+
+        # Warm the matcher (BLAS thread pool, index search) here rather
+        # than on the first face that walks up to the camera
+        if len(matrix):
+            self._best_matches([matrix[0]], known)
+
+        # Single reference swap: the recognition thread sees either the
+        # old set or the new one, never a mix
+        self._known = known
+
+        logger.info(f"Loaded {len(matrix)} encodings")
+        return len(matrix)
+
+    @staticmethod
+    def _fingerprint(encodings) -> Optional[bytes]:
+        """Digest of the rows ``load_encodings`` builds its state from.
+
+        ``None`` (never equal to a stored digest) for malformed rows.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            for enc_data in encodings:
+                raw = enc_data['encoding_data']
+                digest.update(raw if isinstance(raw, bytes) else str(raw).encode())
+                digest.update(repr((
+                    enc_data['worker_id'], enc_data['first_name'],
+                    enc_data['last_name'], enc_data['worker_code'])).encode())
+        except (KeyError, IndexError, TypeError):
+            return None
+        return digest.digest()
+
+    @staticmethod
+    def _build_index(known: np.ndarray):
+        """HNSW index over ``known`` when enabled and worth it, else None.
+
+        Vectors are stored 8-bit scalar-quantized (4× less memory to walk
+        per query); candidates are re-scored against the float32 matrix
+        in ``_best_matches``, so the tolerance check stays exact.
+        """
+        if not (Config.USE_FAISS and HAS_FAISS):
+            return None
+        if len(known) < FAISS_MIN_ENCODINGS:
+            return None
+        index = faiss.IndexHNSWSQ(
+            known.shape[1], faiss.ScalarQuantizer.QT_8bit, 32)  # L2 metric
+        index.train(known)
+        index.add(known)
+        return index
+
+    def _best_matches(
+        self, encodings: List[np.ndarray], known: _KnownFaces
+    ) -> List[Tuple[Optional[int], float]]:
+        """Nearest face in ``known`` within tolerance for each query encoding.
+
+        Euclidean distance (same metric and tolerance as
+        ``face_recognition.compare_faces``) expanded as
+        ``|k|² - 2k·q + |q|²``, so all queries are scored with a single
+        matrix product. Each result is ``(index, distance)``, with
+        ``index=None`` when nothing is close enough; indices refer to
+        ``known.metadata``.
+        """
+        if not len(encodings):
+            return []
+        if len(known.encodings) == 0:
+            return [(None, float('inf'))] * len(encodings)
+
+        queries = np.asarray(encodings, dtype=np.float32).reshape(len(encodings), -1)
+        if known.index is not None:
+            _, ids = known.index.search(queries, FAISS_RERANK_K)
+            best_idx = np.empty(len(queries), dtype=np.int64)
+            distances = np.full(len(queries), np.inf, dtype=np.float32)
+            for row, (q, cand) in enumerate(zip(queries, ids)):
+                cand = cand[cand >= 0]
+                if cand.size == 0:
+                    best_idx[row] = -1
+                    continue
+                d = np.linalg.norm(known.encodings[cand] - q, axis=1)
+                best = int(np.argmin(d))
+                best_idx[row] = cand[best]
+                distances[row] = d[best]
+        else:
+            # (N_known, N_query) squared distances minus the |q|² term
+            sq = (known.sq_norms[:, None]
+                  - 2.0 * (known.encodings @ queries.T))
+            best_idx = np.argmin(sq, axis=0)
+            best_sq = sq[best_idx, np.arange(len(queries))]
+            best_sq += np.einsum('ij,ij->i', queries, queries)
+            distances = np.sqrt(np.maximum(best_sq, 0.0))
+
+        return [
+            (int(idx), float(dist))
+            if idx >= 0 and dist <= self.tolerance else (None, float(dist))
+            for idx, dist in zip(best_idx, distances)
+        ]
     
     def _load_from_mysql(self, project_id=None) -> List[Dict[str, Any]]:
         """Load from MySQL, optionally filtered by project."""
@@ -109,157 +278,6 @@ class FaceRecognizer:
             """
             return self.mysql_db.fetch_all(query)
     
-    def recognize_face(self, frame: np.ndarray) -> Tuple[Optional[Dict[str, Any]], np.ndarray, Optional[Tuple[int, int, int, int]]]:
-        """
-        SMOOTH CONTINUOUS face recognition - tracks faces every frame
-        
-        Returns:
-            (worker_info, annotated_frame, face_box) or (None, frame_with_all_faces, None)
-        """
-        if not self.known_encodings:
-            return None, frame, None
-        
-        # Resize for speed
-        small_frame = cv2.resize(frame, (0, 0), fx=self.scale_factor, fy=self.scale_factor)
-        rgb_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-        
-        # Detect ALL faces - FAST mode
-        face_locations = face_recognition.face_locations(
-            rgb_frame, 
-            model='hog',
-            number_of_times_to_upsample=0
-        )
-        
-        # If no faces found, keep showing last known faces briefly
-        if not face_locations:
-            # Draw last known faces (faded)
-            for i, (top, right, bottom, left) in enumerate(self.last_face_locations):
-                if i < len(self.last_face_names):
-                    name = self.last_face_names[i]
-                    cv2.rectangle(frame, (left, top), (right, bottom), (0, 150, 0), 2)
-                    cv2.putText(frame, name, (left, max(25, top - 10)),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 150, 0), 2)
-            return None, frame, None
-        
-        # Get encodings for detected faces
-        face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
-        
-        # Get facial landmarks for mesh visualization
-        face_landmarks_list = []
-        try:
-            face_landmarks_list = face_recognition.face_landmarks(rgb_frame)
-        except Exception:
-            pass  # Skip on error
-        
-        # Scale back to original size
-        scale_reciprocal = 1.0 / self.scale_factor
-        
-        first_recognized_worker = None
-        first_face_box = None
-        
-        current_face_locations = []
-        current_face_names = []
-        current_face_ids = []
-        
-        # Process each face
-        for face_idx, ((top, right, bottom, left), encoding) in enumerate(zip(face_locations, face_encodings)):
-            # Scale coordinates
-            top = int(top * scale_reciprocal)
-            right = int(right * scale_reciprocal)
-            bottom = int(bottom * scale_reciprocal)
-            left = int(left * scale_reciprocal)
-            
-            current_face_locations.append((top, right, bottom, left))
-            
-            # Draw facial landmarks mesh for this face (if available)
-            if face_idx < len(face_landmarks_list):
-                landmarks = face_landmarks_list[face_idx]
-                for feature_name, points in landmarks.items():
-                    # Scale landmark points to full resolution
-                    scaled_points = [(int(x * scale_reciprocal), int(y * scale_reciprocal)) for x, y in points]
-                    
-                    # Draw lines connecting the points
-                    for i in range(len(scaled_points) - 1):
-                        cv2.line(frame, scaled_points[i], scaled_points[i + 1], (255, 200, 0), 1)
-                    
-                    # Close the loop for certain features
-                    if feature_name in ['chin', 'left_eyebrow', 'right_eyebrow', 
-                                       'nose_bridge', 'left_eye', 'right_eye',
-                                       'top_lip', 'bottom_lip']:
-                        if len(scaled_points) > 2:
-                            cv2.line(frame, scaled_points[-1], scaled_points[0], (255, 200, 0), 1)
-                    
-                    # Draw small dots on key points
-                    for point in scaled_points:
-                        cv2.circle(frame, point, 1, (255, 220, 50), -1)
-            
-            # Compare with known faces
-            matches = face_recognition.compare_faces(
-                self.known_encodings,
-                encoding,
-                tolerance=self.tolerance
-            )
-            
-            if True not in matches:
-                # Unknown - draw red box CONTINUOUSLY
-                cv2.rectangle(frame, (left, top), (right, bottom), (0, 0, 255), 4)
-                
-                # Shadow
-                cv2.putText(frame, "Unknown", (left + 2, max(25, top - 10) + 2),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 3)
-                # Main text
-                cv2.putText(frame, "Unknown", (left, max(25, top - 10)),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
-                
-                current_face_names.append("Unknown")
-                current_face_ids.append(None)
-                continue
-            
-            # Best match
-            face_distances = face_recognition.face_distance(
-                self.known_encodings, 
-                encoding
-            )
-            best_match_idx = np.argmin(face_distances)
-            
-            if matches[best_match_idx]:
-                worker_info = self.known_metadata[best_match_idx].copy()
-                confidence = 1 - face_distances[best_match_idx]
-                worker_info['confidence'] = confidence
-                
-                # Draw GREEN box CONTINUOUSLY - THICK and BRIGHT
-                cv2.rectangle(frame, (left, top), (right, bottom), (0, 255, 0), 5)
-                
-                # Draw NAME above box
-                first = worker_info.get("first_name") or ""
-                last = worker_info.get("last_name") or ""
-                name = f"{first} {last}".strip() or "Unknown"
-                
-                current_face_names.append(name)
-                current_face_ids.append(worker_info.get('worker_id'))
-                
-                label_y = max(30, top - 10)
-                
-                # Shadow for readability
-                cv2.putText(frame, name, (left + 2, label_y + 2),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 0), 4)
-                # Main text - BRIGHT GREEN
-                cv2.putText(frame, name, (left, label_y),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
-                
-                # Store first recognized worker for confirmation system
-                if first_recognized_worker is None:
-                    first_recognized_worker = worker_info
-                    first_face_box = (top, right, bottom, left)
-        
-        # Update cache - ALWAYS maintain tracking
-        self.last_face_locations = current_face_locations
-        self.last_face_names = current_face_names
-        self.last_face_ids = current_face_ids
-        
-        # Return first recognized worker (if any) for confirmation
-        return first_recognized_worker, frame, first_face_box
-    
     def train_new_face(self, images: List[np.ndarray], worker_id: int) -> bool:
         """Train new face"""
         encodings = []
@@ -314,11 +332,16 @@ class FaceRecognizer:
     #   detect_and_recognize — returns structured face list
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     def detect_and_recognize(
-        self, frame: np.ndarray
+        self, frame: np.ndarray, mirror: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Detect all faces and recognize them.
 
+        With ``mirror`` the frame is treated as horizontally flipped (the
+        selfie view); boxes are returned in mirrored coordinates. Only
+        the small detection copy is flipped up front, the full-size
+        frame just when a face has been found.
+
         Returns list of dicts:
             [{
                 'worker_id': int | None,
@@ -326,94 +349,77 @@ class FaceRecognizer:
                 'worker_code': str,
                 'confidence': float,
                 'box': (top, right, bottom, left),
-                'landmarks': {feature: [(x,y), ...]}
+                'area': int,  # box area in pixels
             }, ...]
         """
-        if not self.known_encodings:
+        known = self._known
+        if len(known.encodings) == 0:
             return []
 
+        # Detect on a small grayscale copy (HOG cost scales with pixels)
         scale = self.scale_factor
-        small = cv2.resize(frame, (0, 0), fx=scale, fy=scale)
-        rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+        src = cv2.UMat(frame) if self.use_opencl else frame
+        small = cv2.resize(
+            src, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        if mirror:
+            gray = cv2.flip(gray, 1)
+        if self.use_opencl:
+            gray = gray.get()
 
-        # Detect faces
-        face_locations = face_recognition.face_locations(
-            rgb, model='hog', number_of_times_to_upsample=0)
-        if not face_locations:
+        small_locations = face_recognition.face_locations(
+            gray, model='hog', number_of_times_to_upsample=0)
+        if not small_locations:
             return []
 
-        face_encodings = face_recognition.face_encodings(rgb, face_locations)
+        # Scale boxes to original frame coordinates
+        inv = 1.0 / scale
+        face_locations = [
+            (int(top * inv), int(right * inv),
+             int(bottom * inv), int(left * inv))
+            for top, right, bottom, left in small_locations
+        ]
 
-        # Landmarks (optional, for mesh visualization)
-        face_landmarks_list = []
-        try:
-            face_landmarks_list = face_recognition.face_landmarks(rgb)
-        except Exception:
-            pass
+        # Encode on the full-resolution frame to preserve accuracy
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if mirror:
+            cv2.flip(rgb, 1, dst=rgb)
+        face_encodings = face_recognition.face_encodings(rgb, face_locations)
 
-        inv = 1.0 / scale
+        # Landmarks are not computed here: the live overlay only draws
+        # boxes and names, and the shape predictor is a per-face cost
         results: List[Dict[str, Any]] = []
 
-        for idx, ((top, right, bottom, left), encoding) in enumerate(
-            zip(face_locations, face_encodings)
-        ):
-            # Scale to original frame coordinates
-            box = (
-                int(top * inv), int(right * inv),
-                int(bottom * inv), int(left * inv),
-            )
-
-            # Scale landmarks
-            landmarks = {}
-            if idx < len(face_landmarks_list):
-                for feature, points in face_landmarks_list[idx].items():
-                    landmarks[feature] = [
-                        (int(x * inv), int(y * inv))
-                        for x, y in points
-                    ]
-
-            # Compare with known faces
-            matches = face_recognition.compare_faces(
-                self.known_encodings, encoding,
-                tolerance=self.tolerance)
-
-            if True not in matches:
-                results.append({
-                    'worker_id': None,
-                    'name': 'Unknown',
-                    'worker_code': '',
-                    'confidence': 0.0,
-                    'box': box,
-                    'landmarks': landmarks,
-                })
-                continue
+        # Compare all faces with the known set in one pass
+        matches = self._best_matches(face_encodings, known)
 
-            distances = face_recognition.face_distance(
-                self.known_encodings, encoding)
-            best_idx = np.argmin(distances)
+        for box, (best_idx, distance) in zip(face_locations, matches):
+            top, right, bottom, left = box
+            area = (bottom - top) * (right - left)
 
-            if matches[best_idx]:
-                meta = self.known_metadata[best_idx]
-                name = (
-                    f"{meta.get('first_name', '')} "
-                    f"{meta.get('last_name', '')}"
-                ).strip() or 'Unknown'
-                results.append({
-                    'worker_id': meta['worker_id'],
-                    'name': name,
-                    'worker_code': meta.get('worker_code', ''),
-                    'confidence': 1 - distances[best_idx],
-                    'box': box,
-                    'landmarks': landmarks,
-                })
-            else:
+            if best_idx is None:
                 results.append({
                     'worker_id': None,
                     'name': 'Unknown',
                     'worker_code': '',
                     'confidence': 0.0,
                     'box': box,
-                    'landmarks': landmarks,
+                    'area': area,
                 })
+                continue
+
+            meta = known.metadata[best_idx]
+            name = (
+                f"{meta.get('first_name', '')} "
+                f"{meta.get('last_name', '')}"
+            ).strip() or 'Unknown'
+            results.append({
+                'worker_id': meta['worker_id'],
+                'name': name,
+                'worker_code': meta.get('worker_code', ''),
+                'confidence': 1 - distance,
+                'box': box,
+                'area': area,
+            })
 
         return results
\ No newline at end of file
@@ -1,6 +1,6 @@
 import logging
 import time
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 from config.settings import Config
 from config.database import MySQLDatabase, SQLiteDatabase
@@ -51,40 +51,130 @@ class SyncManager:
             return self._sync_via_http()
 
         logger.warning("No sync path available (MySQL offline, no API URL)")
-        pending = self.sqlite_db.get_pending_records()
-        return {'synced': 0, 'failed': 0, 'pending': len(pending)}
+        pending = self.sqlite_db.count_pending_records()
+        return {'synced': 0, 'failed': 0, 'pending': pending}
 
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     #   MySQL sync
     # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
     def _sync_via_mysql(self) -> Dict[str, int]:
         pending = self.sqlite_db.get_pending_records()
-        synced = 0
         failed = 0
+        batch = []
 
         for record in pending:
-            bid = record['id']
-            rkey = f"buffer_{bid}"
-
+            rkey = f"buffer_{record['id']}"
             if self.retry_count.get(rkey, 0) >= Config.MAX_RETRY_ATTEMPTS:
                 failed += 1
-                continue
-
-            if self._sync_record_mysql(record):
-                self.sqlite_db.mark_synced(bid)
-                synced += 1
-                self.retry_count.pop(rkey, None)
             else:
-                failed += 1
-                self.retry_count[rkey] = self.retry_count.get(rkey, 0) + 1
+                batch.append(record)
+
+        synced_ids, failed_ids = self._push_batch_mysql(batch)
 
-        remaining = len(pending) - synced - failed
+        self.sqlite_db.mark_synced_many(synced_ids)
+        for bid in synced_ids:
+            self.retry_count.pop(f"buffer_{bid}", None)
+        for bid in failed_ids:
+            rkey = f"buffer_{bid}"
+            self.retry_count[rkey] = self.retry_count.get(rkey, 0) + 1
+
+        synced = len(synced_ids)
+        failed += len(failed_ids)
+        remaining = self.sqlite_db.count_pending_records() - failed
         if synced:
             logger.info(
                 f"MySQL sync: {synced} synced, {failed} failed, "
                 f"{remaining} pending")
         return {'synced': synced, 'failed': failed, 'pending': remaining}
 
+    def _push_batch_mysql(
+        self, records: List[Dict[str, Any]]
+    ) -> Tuple[List[int], List[int]]:
+        """Push buffer rows with batched INSERT/UPDATE statements.
+
+        Returns (synced_ids, failed_ids).
+        """
+        if not records:
+            return [], []
+
+        existing = self._fetch_existing_attendance(records)
+
+        synced_ids: List[int] = []
+        failed_ids: List[int] = []
+        inserts, insert_ids = [], []
+        updates, update_ids = [], []
+        deferred = []
+        new_keys = set()
+
+        for record in records:
+            key = (record['worker_id'], str(record['attendance_date']))
+            if key in existing:
+                if record['time_out']:
+                    updates.append((record['time_out'], record['hours_worked'],
+                                    existing[key]))
+                    update_ids.append(record['id'])
+                else:
+                    synced_ids.append(record['id'])
+            elif key in new_keys:
+                # Same worker/day twice in one batch — needs the new row id
+                deferred.append(record)
+            else:
+                new_keys.add(key)
+                inserts.append((
+                    record['worker_id'],
+                    record['attendance_date'],
+                    record['time_in'],
+                    record['time_out'],
+                    record['status'],
+                    record['hours_worked'],
+                ))
+                insert_ids.append(record['id'])
+
+        if inserts:
+            ok = self.mysql_db.execute_many("""
+                INSERT INTO attendance
+                (worker_id, attendance_date, time_in, time_out,
+                 status, hours_worked)
+                VALUES (%s, %s, %s, %s, %s, %s)
+            """, inserts) is not None
+            (synced_ids if ok else failed_ids).extend(insert_ids)
+
+        if updates:
+            ok = self.mysql_db.execute_many("""
+                UPDATE attendance
+                SET time_out = %s, hours_worked = %s,
+                    updated_at = NOW()
+                WHERE attendance_id = %s AND time_out IS NULL
+            """, updates) is not None
+            (synced_ids if ok else failed_ids).extend(update_ids)
+
+        for record in deferred:
+            if self._sync_record_mysql(record):
+                synced_ids.append(record['id'])
+            else:
+                failed_ids.append(record['id'])
+
+        return synced_ids, failed_ids
+
+    def _fetch_existing_attendance(
+        self, records: List[Dict[str, Any]]
+    ) -> Dict[Tuple[int, str], int]:
+        """Map (worker_id, date) → attendance_id for rows already in MySQL."""
+        keys = list({
+            (r['worker_id'], str(r['attendance_date'])) for r in records})
+        placeholders = ', '.join(['(%s, %s)'] * len(keys))
+        rows = self.mysql_db.fetch_all(f"""
+            SELECT attendance_id, worker_id, attendance_date
+            FROM attendance
+            WHERE is_archived = 0
+            AND (worker_id, attendance_date) IN ({placeholders})
+        """, tuple(v for key in keys for v in key))
+        return {
+            (row['worker_id'], str(row['attendance_date'])):
+                row['attendance_id']
+            for row in rows
+        }
+
     def _sync_record_mysql(self, record: Dict[str, Any]) -> bool:
         try:
             existing = self.mysql_db.fetch_one("""
@@ -162,9 +252,8 @@ class SyncManager:
                 data = resp.json()
                 if data.get('success'):
                     synced_ids = data.get('synced_ids', [])
-                    for bid in synced_ids:
-                        self.sqlite_db.mark_synced(bid)
-                        synced += 1
+                    self.sqlite_db.mark_synced_many(synced_ids)
+                    synced = len(synced_ids)
                     failed = len(pending) - synced
                     logger.info(f"HTTP sync: {synced} synced")
                 else:
@@ -179,5 +268,5 @@ class SyncManager:
             failed = len(pending)
             logger.error(f"HTTP sync exception: {e}")
 
-        remaining = len(pending) - synced - failed
+        remaining = self.sqlite_db.count_pending_records() - failed
         return {'synced': synced, 'failed': failed, 'pending': remaining}
\ No newline at end of file
@@ -8,6 +8,13 @@ import sys
 import numpy as np
 from config.database import MySQLDatabase, SQLiteDatabase
 from models.face_recognizer import FaceRecognizer
+from utils.display import draw_landmarks
+
+# 70% green (0, 180, 0) over 30% frame as one affine colour transform:
+# out = 0.3 * pixel + 0.7 * green, in a single pass
+SUCCESS_TINT = np.hstack([
+    np.eye(3) * 0.3, np.array([[0.0], [0.7 * 180], [0.0]])
+]).astype(np.float32)
 
 
 def list_workers(mysql_db: MySQLDatabase):
@@ -146,22 +153,8 @@ def capture_training_images(worker_id: int, worker_name: str, num_images: int =
         # Draw facial landmarks mesh CONTINUOUSLY (not just on detect interval)
         if face_detected and face_landmarks_list:
             try:
-                for face_landmarks in face_landmarks_list:
-                    # Draw facial feature points
-                    for feature_name, points in face_landmarks.items():
-                        # Draw lines connecting the points
-                        for i in range(len(points) - 1):
-                            cv2.line(display_frame, points[i], points[i + 1], (0, 255, 255), 1)
-                        # Close the loop for certain features
-                        if feature_name in ['chin', 'left_eyebrow', 'right_eyebrow', 
-                                           'nose_bridge', 'left_eye', 'right_eye',
-                                           'top_lip', 'bottom_lip']:
-                            if len(points) > 2:
-                                cv2.line(display_frame, points[-1], points[0], (0, 255, 255), 1)
-                        
-                        # Draw small circles on key points
-                        for point in points:
-                            cv2.circle(display_frame, point, 1, (0, 200, 255), -1)
+                draw_landmarks(display_frame, face_landmarks_list,
+                               (0, 255, 255), (0, 200, 255))
             except Exception:
                 pass
 
@@ -261,11 +254,8 @@ def capture_training_images(worker_id: int, worker_name: str, num_images: int =
                 
                 h, w = frame.shape[:2]
                 
-                # Create green success overlay
-                success_screen = frame.copy()
-                overlay = success_screen.copy()
-                cv2.rectangle(overlay, (0, 0), (w, h), (0, 180, 0), -1)
-                cv2.addWeighted(overlay, 0.7, success_screen, 0.3, 0, success_screen)
+                # Create green success overlay (frame is fresh; tint in place)
+                success_screen = cv2.transform(frame, SUCCESS_TINT, dst=frame)
                 
                 # Text content
                 text1 = "CAPTURE COMPLETE!"
@@ -39,6 +39,7 @@ except ImportError:
 
 from config.database import MySQLDatabase, SQLiteDatabase
 from models.face_recognizer import FaceRecognizer
+from utils.display import draw_landmarks
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -326,7 +327,7 @@ class FaceRegistrationApp:
             LEFT JOIN face_encodings fe ON w.worker_id = fe.worker_id AND fe.is_active = 1
             WHERE w.is_archived = 0
             ORDER BY w.last_name, w.first_name
-        """) or []
+        """, retry=False) or []
 
         self._filter_workers()
 
@@ -705,8 +706,10 @@ class FaceRegistrationApp:
             return
 
         frame = cv2.flip(frame, 1)
+        # flip() returned a fresh array and the raw frame is never drawn
+        # on (readers copy it), so it can be shared without a copy
         with self.frame_lock:
-            self.current_raw_frame = frame.copy()
+            self.current_raw_frame = frame
 
         display = frame.copy()
         h, w = display.shape[:2]
@@ -715,7 +718,7 @@ class FaceRegistrationApp:
         self.face_quality_ok, quality_msg = self._check_face_quality(
             self.face_locations, h, w)
 
-        now = time.time()
+        now = time.monotonic()
 
         # Draw face rectangles with quality color
         for top, right, bottom, left in self.face_locations:
@@ -730,17 +733,8 @@ class FaceRegistrationApp:
         # Draw facial landmarks mesh
         if SHOW_LANDMARKS and face_detected and self.face_landmarks:
             try:
-                for landmarks in self.face_landmarks:
-                    for feature_name, points in landmarks.items():
-                        for i in range(len(points) - 1):
-                            cv2.line(display, points[i], points[i + 1], (0, 255, 255), 1)
-                        if feature_name in ('chin', 'left_eyebrow', 'right_eyebrow',
-                                            'nose_bridge', 'left_eye', 'right_eye',
-                                            'top_lip', 'bottom_lip'):
-                            if len(points) > 2:
-                                cv2.line(display, points[-1], points[0], (0, 255, 255), 1)
-                        for point in points:
-                            cv2.circle(display, point, 1, (0, 200, 255), -1)
+                draw_landmarks(display, self.face_landmarks,
+                               (0, 255, 255), (0, 200, 255))
             except Exception:
                 pass
 
@@ -833,7 +827,7 @@ class FaceRegistrationApp:
         self._set_status(f"Captured {count}/{NUM_CAPTURES}", SUCCESS)
 
         # Flash effect — overlay on video feed
-        self.capture_flash_until = time.time() + 0.25
+        self.capture_flash_until = time.monotonic() + 0.25
 
         if count >= NUM_CAPTURES:
             self._stop_camera()
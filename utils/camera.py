@@ -1,6 +1,6 @@
 import cv2
 import logging
-from threading import Thread, Lock
+from threading import Thread, Condition
 from typing import Optional, Tuple
 import numpy as np
 
@@ -15,10 +15,13 @@ class Camera:
         self.cap: Optional[cv2.VideoCapture] = None
         self.frame: Optional[np.ndarray] = None
         self.ret = False
+        self.frame_id = 0  # Incremented for every published frame
         self.is_running = False
+        # Set by readers; the next grabbed frame is decoded only if set
+        self._wanted = False
         
-        # Threading
-        self.lock = Lock()
+        # Threading — the condition doubles as the frame lock
+        self.lock = Condition()
         self.thread: Optional[Thread] = None
     
     def initialize(self) -> bool:
@@ -35,11 +38,18 @@ class Camera:
             
             logger.info("Camera opened successfully")
             
+            # Minimal driver queue, set before the format so V4L2
+            # allocates one buffer instead of the default four
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            if int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE)) != 1:
+                # The capture thread grab()s every frame, which keeps
+                # the queue drained even without driver support
+                logger.info("Camera backend ignored BUFFERSIZE=1")
+            
             # Set properties
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
             self.cap.set(cv2.CAP_PROP_FPS, 30)
-            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Minimal buffer
             
             # Test read
             ret, frame = self.cap.read()
@@ -63,22 +73,64 @@ class Camera:
             return False
     
     def _read_frames(self):
-        """Background thread for reading frames"""
+        """Background thread for reading frames.
+
+        Every frame is grabbed so the driver queue never goes stale, but
+        it is only decoded (retrieve) when a reader has asked for a newer
+        frame since the last one was published.
+        """
         while self.is_running:
             if self.cap and self.cap.isOpened():
-                ret, frame = self.cap.read()
-                
+                if not self.cap.grab():
+                    with self.lock:
+                        self.ret = False
+                        self.frame = None
+                    continue
+
+                with self.lock:
+                    wanted, self._wanted = self._wanted, False
+                if not wanted:
+                    continue
+
+                ret, frame = self.cap.retrieve()
+                if ret:
+                    # Published frames are shared with wait_frame() callers
+                    frame.flags.writeable = False
+
                 with self.lock:
                     self.ret = ret
                     self.frame = frame
+                    if ret:
+                        self.frame_id += 1
+                        self.lock.notify_all()
+                    else:
+                        self._wanted = True  # Retry on the next grab
     
     def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
         """Get latest frame (non-blocking)"""
         with self.lock:
+            self._wanted = True
             if self.frame is not None:
                 return self.ret, self.frame.copy()
             else:
                 return False, None
+
+    def wait_frame(
+        self, last_id: int, timeout: float = 0.5
+    ) -> Tuple[int, Optional[np.ndarray]]:
+        """Block until a frame newer than ``last_id`` arrives.
+
+        Returns ``(frame_id, frame)``, or ``(last_id, None)`` on timeout.
+        Frames captured in between are skipped, never queued. The frame
+        is shared and read-only; copy it before drawing on it.
+        """
+        with self.lock:
+            if self.frame_id == last_id:
+                self._wanted = True  # Decode the next grabbed frame
+            if not self.lock.wait_for(
+                    lambda: self.frame_id != last_id, timeout):
+                return last_id, None
+            return self.frame_id, self.frame
     
     def set_resolution(self, width: int, height: int):
         """Set resolution"""
@@ -1,10 +1,51 @@
 import cv2
 import numpy as np
 import logging
-from typing import Tuple
+from typing import Tuple, List, Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# Landmark features drawn as closed outlines
+CLOSED_FEATURES = frozenset((
+    'chin', 'left_eyebrow', 'right_eyebrow', 'nose_bridge',
+    'left_eye', 'right_eye', 'top_lip', 'bottom_lip',
+))
+
+
+def draw_landmarks(frame: np.ndarray,
+                   faces: List[Dict[str, Any]],
+                   line_color: Tuple[int, int, int],
+                   dot_color: Tuple[int, int, int]) -> None:
+    """Draw the landmark mesh for every face in two polylines calls.
+
+    ``faces`` is the output of ``face_recognition.face_landmarks``.
+    Points are marked by writing pixels directly rather than one
+    ``cv2.circle`` call each.
+    """
+    closed, opened = [], []
+    for landmarks in faces:
+        for feature_name, points in landmarks.items():
+            if len(points) == 0:
+                continue
+            pts = np.asarray(points, dtype=np.int32).reshape(-1, 1, 2)
+            if feature_name in CLOSED_FEATURES and len(points) > 2:
+                closed.append(pts)
+            else:
+                opened.append(pts)
+
+    if not closed and not opened:
+        return
+    if closed:
+        cv2.polylines(frame, closed, True, line_color, 1)
+    if opened:
+        cv2.polylines(frame, opened, False, line_color, 1)
+
+    pts = np.concatenate(closed + opened).reshape(-1, 2)
+    h, w = frame.shape[:2]
+    xs, ys = pts[:, 0], pts[:, 1]
+    inside = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+    frame[ys[inside], xs[inside]] = dot_color
+
 
 class Display:
     """Optimized display handler"""
@@ -41,6 +82,9 @@ class Display:
     
     def wait_key(self, delay: int = 1) -> int:
         """Wait for key"""
+        if delay <= 1 and hasattr(cv2, 'pollKey'):
+            # Pumps GUI events like waitKey, without the 1 ms minimum wait
+            return cv2.pollKey() & 0xFF
         return cv2.waitKey(delay) & 0xFF
     
     def show_message(self, message: str, duration_ms: int = 2000):
@@ -63,11 +107,11 @@ class Display:
         """Add status bar"""
         height, width = frame.shape[:2]
         
-        # Semi-transparent bar
-        overlay = frame.copy()
+        # Semi-transparent black bar: darken the bottom rows in place
+        # (same result as blending a filled copy, without the copy)
         bar_height = 50
-        cv2.rectangle(overlay, (0, height - bar_height), (width, height), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+        bar = frame[height - bar_height:]
+        cv2.convertScaleAbs(bar, dst=bar, alpha=0.3)
         
         # Text
         font = cv2.FONT_HERSHEY_SIMPLEX